@@ -1,10 +1,51 @@
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from rest_framework import serializers, exceptions
-from core.utils import ModelPluggableTokenAuthentication
 from events.models import Event
+from talks.live import is_play_authorized, live_talks
 from talks.models import Talk
-from users.models import PlayStreamKey
+from talks.viewers import add_viewer, clear_viewers, remove_viewer
+from users.keys import get_key_user_id
+
+
+def parse_stream_url(stream_url):
+    """Return the talk id of a stream_url of the form /live/talk_id."""
+    message = "Invalid stream_url"
+    segments = stream_url.split("/")
+    if len(segments) != 3 or segments[1] != "live":
+        raise serializers.ValidationError(message)
+    try:
+        return int(segments[2])
+    except Exception:
+        raise serializers.ValidationError(message)
+
+
+def parse_stream_token(param):
+    """Return the token of a param of the form ?token=token."""
+    query_params = {}
+    if param.startswith("?"):
+        param = param[1:]
+    if len(param) != 0:
+        try:
+            query_params = dict(
+                segment.split("=") for segment in param.split("&")
+            )
+        except Exception:
+            raise serializers.ValidationError("Invalid query string")
+    if "token" not in query_params:
+        raise exceptions.AuthenticationFailed()
+    return query_params["token"]
+
+
+def validate_talk_is_live(talk):
+    if talk.has_finished() or not talk.has_started():
+        raise exceptions.PermissionDenied()
+
+
+def get_play_authorization_queryset(talk_id, user_id):
+    return Event.objects.filter(
+        (Q(attendees=user_id) | Q(organizer=user_id)) & Q(talk__id=talk_id)
+    )
 
 
 # Validate that stream_url has the form /live/talk_id and
@@ -13,47 +54,25 @@ from users.models import PlayStreamKey
 class StreamSerializer(serializers.Serializer):
     stream_url = serializers.CharField()
     param = serializers.CharField(allow_blank=True)
+    client_id = serializers.CharField(required=False)
 
     def validate_stream_url(self, stream_url):
-        segments = stream_url.split("/")
-        if len(segments) != 3 or segments[1] != "live":
-            message = "Invalid stream_url"
-            raise serializers.ValidationError(message)
-        stream = -1
-        try:
-            stream = int(segments[2])
-        except Exception:
-            message = "Invalid stream_url"
-            raise serializers.ValidationError(message)
-
-        self.talk = get_object_or_404(
-            Talk, Q(status="approved", event__is_published=True), pk=stream
-        )
-        if self.talk.has_finished() or not self.talk.has_started():
-            raise exceptions.PermissionDenied()
+        stream = parse_stream_url(stream_url)
+        self.talk = live_talks.get(stream)
+        if self.talk is None:
+            self.talk = get_object_or_404(
+                Talk, Q(status="approved", event__is_published=True), pk=stream
+            )
+        validate_talk_is_live(self.talk)
         return stream_url
 
     def validate_param(self, param):
-        message = "Invalid query string"
-        if len(param) == 0:
-            self.query_params = ""
-            self.validate_token()
-            return param
-        if param[0] == "?":
-            param = param[1:]
-        try:
-            self.query_params = dict(
-                segment.split("=") for segment in param.split("&")
-            )
-        except Exception:
-            raise serializers.ValidationError(message)
-        self.validate_token()
+        self.token = parse_stream_token(param)
         return param
 
     def validate_token(self):
-        if "token" not in self.query_params:
+        if getattr(self, "token", None) is None:
             raise exceptions.AuthenticationFailed()
-        self.token = self.query_params.get("token")
 
 
 class PublishStreamSerializer(StreamSerializer):
@@ -67,15 +86,42 @@ class PublishStreamSerializer(StreamSerializer):
 class PlayStreamSerializer(StreamSerializer):
     def validate(self, attrs):
         self.validate_token()
-        knox_auth = ModelPluggableTokenAuthentication()
-        knox_auth.model = PlayStreamKey
-        user, _ = knox_auth.authenticate_credentials(
-            self.token.encode("utf-8")
-        )
-        if not Event.objects.filter(
-            (Q(attendees=user) | Q(organizer=user)) & Q(talk__id=self.talk.id)
-        ).exists():
+        user_id = get_key_user_id(self.token, "play_stream", self.talk.id)
+        if not is_play_authorized(
+            self.talk.id,
+            user_id,
+            get_play_authorization_queryset(self.talk.id, user_id).exists,
+        ):
+            raise exceptions.PermissionDenied()
+        if "client_id" in attrs:
+            add_viewer(self.talk.id, user_id, attrs["client_id"])
+        return attrs
+
+
+# Validate that stream_url has the form /live/talk_id, without requiring
+# the talk to be live, as streams stop after their talk ends.
+class StopStreamSerializer(serializers.Serializer):
+    stream_url = serializers.CharField()
+    client_id = serializers.CharField()
+
+    def validate_stream_url(self, stream_url):
+        return parse_stream_url(stream_url)
+
+    def validate(self, attrs):
+        remove_viewer(attrs["stream_url"], attrs["client_id"])
+        return attrs
+
+
+class UnpublishStreamSerializer(serializers.Serializer):
+    stream_url = serializers.CharField()
+    param = serializers.CharField(allow_blank=True)
+
+    def validate(self, attrs):
+        talk_id = parse_stream_url(attrs["stream_url"])
+        token = parse_stream_token(attrs["param"])
+        if not Talk.objects.filter(pk=talk_id, stream_key=token).exists():
             raise exceptions.PermissionDenied()
+        clear_viewers(talk_id)
         return attrs
 
 
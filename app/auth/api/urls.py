@@ -16,6 +16,22 @@ urlpatterns = [
     path("login", auth.LoginView.as_view(), name="knox-login"),
     path("logout", auth.LogoutView.as_view(), name="knox-logout"),
     path("register", auth.RegisterView.as_view(), name="user-register"),
+    path(
+        "streams/async/publish/",
+        streaming.async_publish,
+        name="stream-async-publish",
+    ),
+    path(
+        "streams/async/play/", streaming.async_play, name="stream-async-play"
+    ),
+    path(
+        "streams/async/stop/", streaming.async_stop, name="stream-async-stop"
+    ),
+    path(
+        "streams/async/unpublish/",
+        streaming.async_unpublish,
+        name="stream-async-unpublish",
+    ),
     path(r"streams/", include(streamsRouter.urls)),
     path(r"verification/", include(verificationRouter.urls)),
 ]
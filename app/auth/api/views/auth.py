@@ -10,6 +10,7 @@ from drf_spectacular.utils import (
     inline_serializer,
 )
 from knox.views import LoginView as KnoxLoginView, LogoutView as KnoxLogoutView
+from core.throttling import IPScopedRateThrottle
 from users.api.serializers import UserSerializer
 from ..serializers.auth import RegisterSerializer, LoginSerializer
 from auth.mails import send_verification_email
@@ -17,10 +18,14 @@ from users.models import VerificationKey
 
 
 @extend_schema_view(
-    post=extend_schema(responses={200: RegisterSerializer, 400: None})
+    post=extend_schema(
+        responses={200: RegisterSerializer, 400: None, 429: None}
+    )
 )
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
+    throttle_classes = [IPScopedRateThrottle]
+    throttle_scope = "register"
 
     def perform_create(self, serializer):
         user = serializer.save()
@@ -42,11 +47,14 @@ class RegisterView(generics.CreateAPIView):
             ),
             400: None,
             403: None,
+            429: None,
         },
     )
 )
 class LoginView(KnoxLoginView):
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = [IPScopedRateThrottle]
+    throttle_scope = "login"
 
     def get_context(self):
         context = super().get_context()
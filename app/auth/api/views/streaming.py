@@ -1,4 +1,7 @@
-from rest_framework import serializers
+import json
+from django.db.models import Q
+from django.http import JsonResponse
+from rest_framework import serializers, exceptions
 from rest_framework.decorators import action
 from rest_framework.exceptions import APIException
 from rest_framework.response import Response
@@ -8,10 +11,20 @@ from drf_spectacular.utils import (
     extend_schema,
     inline_serializer,
 )
+from talks.live import ais_play_authorized, live_talks
+from talks.models import Talk
+from talks.viewers import aadd_viewer, aclear_viewers, aremove_viewer
+from users.keys import aget_key_user_id
 from ..serializers.streaming import (
     StreamSerializer,
     PublishStreamSerializer,
     PlayStreamSerializer,
+    StopStreamSerializer,
+    UnpublishStreamSerializer,
+    get_play_authorization_queryset,
+    parse_stream_token,
+    parse_stream_url,
+    validate_talk_is_live,
 )
 
 
@@ -55,6 +68,23 @@ docs_stream_serializer = inline_serializer(
             404: docs_stream_serializer,
         },
     ),
+    stop=extend_schema(
+        description="Ends the play session of the client_id."
+        " SRS service uses this endpoint to count the viewers of the"
+        " talk.",
+        responses={200: docs_stream_serializer, 400: docs_stream_serializer},
+    ),
+    unpublish=extend_schema(
+        description="Ends the play sessions of the talk stream."
+        " The token should be the talk stream-key."
+        " SRS service uses this endpoint to count the viewers of the"
+        " talk.",
+        responses={
+            200: docs_stream_serializer,
+            401: docs_stream_serializer,
+            403: docs_stream_serializer,
+        },
+    ),
 )
 class StreamAuthViewSet(GenericViewSet):
     serializer_class = StreamSerializer
@@ -64,6 +94,10 @@ class StreamAuthViewSet(GenericViewSet):
             return PublishStreamSerializer
         elif self.action == "play":
             return PlayStreamSerializer
+        elif self.action == "stop":
+            return StopStreamSerializer
+        elif self.action == "unpublish":
+            return UnpublishStreamSerializer
         return self.serializer_class
 
     @action(detail=False, methods=["post"], url_path="publish")
@@ -74,6 +108,14 @@ class StreamAuthViewSet(GenericViewSet):
     def play(self, request):
         return self.run_serializer(request)
 
+    @action(detail=False, methods=["post"], url_path="stop")
+    def stop(self, request):
+        return self.run_serializer(request)
+
+    @action(detail=False, methods=["post"], url_path="unpublish")
+    def unpublish(self, request):
+        return self.run_serializer(request)
+
     def run_serializer(self, request):
         serializer = self.get_serializer(data=request.data)
         try:
@@ -83,3 +125,95 @@ class StreamAuthViewSet(GenericViewSet):
             return Response(
                 status=e.status_code, data={"code": 0, "msg": e.detail}
             )
+
+
+# Async versions of the StreamAuthViewSet hooks, served by the ASGI server so
+# that bursts of hooks don't wait for the WSGI workers.
+
+
+def parse_hook_request(request, *fields):
+    """Return the fields of the JSON body of an SRS hook request."""
+    try:
+        data = json.loads(request.body)
+        return [str(data[field]) for field in fields]
+    except (ValueError, KeyError, TypeError):
+        raise exceptions.ValidationError("Invalid hook request")
+
+
+async def aget_stream(request):
+    """Return the live talk and the token of an SRS hook request."""
+    stream_url, param = parse_hook_request(request, "stream_url", "param")
+    stream = parse_stream_url(stream_url)
+    talk = await live_talks.aget(stream)
+    if talk is None:
+        try:
+            talk = await Talk.objects.aget(
+                Q(status="approved", event__is_published=True), pk=stream
+            )
+        except Talk.DoesNotExist:
+            raise exceptions.NotFound()
+    validate_talk_is_live(talk)
+    return talk, parse_stream_token(param)
+
+
+async def apublish(request):
+    talk, token = await aget_stream(request)
+    if talk.stream_key != token:
+        raise exceptions.PermissionDenied()
+
+
+async def aplay(request):
+    talk, token = await aget_stream(request)
+    user_id = await aget_key_user_id(token, "play_stream", talk.id)
+    if not await ais_play_authorized(
+        talk.id,
+        user_id,
+        get_play_authorization_queryset(talk.id, user_id).aexists,
+    ):
+        raise exceptions.PermissionDenied()
+    try:
+        (client_id,) = parse_hook_request(request, "client_id")
+    except exceptions.ValidationError:
+        return
+    await aadd_viewer(talk.id, user_id, client_id)
+
+
+async def astop(request):
+    stream_url, client_id = parse_hook_request(
+        request, "stream_url", "client_id"
+    )
+    await aremove_viewer(parse_stream_url(stream_url), client_id)
+
+
+async def aunpublish(request):
+    stream_url, param = parse_hook_request(request, "stream_url", "param")
+    talk_id = parse_stream_url(stream_url)
+    token = parse_stream_token(param)
+    if not await Talk.objects.filter(pk=talk_id, stream_key=token).aexists():
+        raise exceptions.PermissionDenied()
+    await aclear_viewers(talk_id)
+
+
+def async_stream_hook(validate):
+    async def view(request):
+        if request.method != "POST":
+            return JsonResponse(
+                {"code": 0, "msg": "Method not allowed"}, status=405
+            )
+        try:
+            await validate(request)
+            return JsonResponse({"code": 0, "msg": "OK"})
+        except APIException as e:
+            return JsonResponse(
+                {"code": 0, "msg": e.detail}, status=e.status_code
+            )
+
+    # The csrf_exempt decorator of Django 4.1 doesn't support async views
+    view.csrf_exempt = True
+    return view
+
+
+async_publish = async_stream_hook(apublish)
+async_play = async_stream_hook(aplay)
+async_stop = async_stream_hook(astop)
+async_unpublish = async_stream_hook(aunpublish)
@@ -11,6 +11,7 @@ from ..serializers.verification import (
     ResendVerficationKeySerializer,
 )
 from auth.mails import send_verification_email
+from core.throttling import IPScopedRateThrottle
 from users.models import VerificationKey
 
 
@@ -19,10 +20,19 @@ from users.models import VerificationKey
         responses={204: None, 400: None, 401: None, 403: None, 404: None},
     ),
     resend_verification_email=extend_schema(
-        responses={204: None, 400: None, 401: None, 403: None, 404: None},
+        responses={
+            204: None,
+            400: None,
+            401: None,
+            403: None,
+            404: None,
+            429: None,
+        },
     ),
 )
 class EmailVerficiationViewSet(GenericViewSet):
+    throttle_scope = None  # Set by the throttled actions
+
     def get_serializer_class(self):
         if self.action == "verify_email":
             return VerficationKeySerializer
@@ -41,6 +51,8 @@ class EmailVerficiationViewSet(GenericViewSet):
         methods=["post"],
         url_path="resend-verification-email",
         url_name="resend-email",
+        throttle_classes=[IPScopedRateThrottle],
+        throttle_scope="verification",
     )
     def resend_verification_email(self, request):
         serializer = self.run_serializer(request)
@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.template.loader import render_to_string
-from core.tasks import send_mail_task
+from core.mails import queue_mail
 
 
 def send_verification_email(username, user_email, verification_key):
@@ -14,4 +14,4 @@ def send_verification_email(username, user_email, verification_key):
         },
     )
 
-    send_mail_task.delay(subject, message, [user_email])
+    queue_mail(subject, message, [user_email])
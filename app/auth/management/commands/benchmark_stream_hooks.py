@@ -0,0 +1,114 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib import error, request
+from django.core.management.base import BaseCommand, CommandError
+from core.redis import get_redis
+from talks.live import get_play_authorization_key
+from talks.models import Talk
+from users.keys import create_key
+
+HOOK_PATHS = {
+    "sync": "/api/v1/auth/streams/play/",
+    "async": "/api/v1/auth/streams/async/play/",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a burst of SRS on_play hooks for a live talk against the"
+        " sync and the async hooks, and compare their latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("talk", type=int, help="The id of a live talk.")
+        parser.add_argument(
+            "--base-url",
+            default="http://reverse-proxy:8081",
+            help="The URL of the reverse proxy.",
+        )
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument(
+            "--async-first",
+            action="store_true",
+            help="Run the async burst before the sync burst.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2:
+            raise CommandError("At least 2 requests are needed.")
+
+        try:
+            talk = Talk.objects.select_related("event__organizer").get(
+                pk=options["talk"]
+            )
+        except Talk.DoesNotExist:
+            raise CommandError("Talk does not exist.")
+
+        # Each viewer joins with their own key, like at the start of a talk
+        viewers = [talk.event.organizer, *talk.event.attendees.all()]
+        tokens = [
+            create_key(viewer, "play_stream", timedelta(hours=1), talk.id)[0]
+            for viewer in viewers
+        ]
+        payloads = [
+            json.dumps(
+                {
+                    "stream_url": f"/live/{talk.id}",
+                    "param": f"?token={tokens[i % len(tokens)]}",
+                }
+            ).encode("utf-8")
+            for i in range(options["requests"])
+        ]
+
+        names = ["sync", "async"]
+        if options["async_first"]:
+            names.reverse()
+        self.stdout.write(f"Order: {', '.join(names)}")
+        authorization_keys = [
+            get_play_authorization_key(talk.id, viewer.pk)
+            for viewer in viewers
+        ]
+        for name in names:
+            # Each burst checks the authorizations from the database, like
+            # the first one did
+            get_redis().delete(*authorization_keys)
+            url = options["base_url"].rstrip("/") + HOOK_PATHS[name]
+            self.run_burst(name, url, payloads, options["concurrency"])
+
+    def run_burst(self, name, url, payloads, concurrency):
+        def send_hook(payload):
+            hook_request = request.Request(
+                url,
+                data=payload,
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            started_at = time.perf_counter()
+            try:
+                with request.urlopen(hook_request, timeout=30) as response:
+                    status = response.status
+            except error.HTTPError as e:
+                status = e.code
+            except error.URLError:
+                status = None
+            return status, time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(send_hook, payloads))
+        duration = time.perf_counter() - started_at
+
+        latencies = sorted(latency for _status, latency in results)
+        errors = sum(1 for status, _latency in results if status != 200)
+        quantiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{name}: {len(results)} requests in {duration:.2f}s"
+            f" ({len(results) / duration:.0f} req/s), {errors} errors,"
+            f" p50 {quantiles[49] * 1000:.1f}ms,"
+            f" p95 {quantiles[94] * 1000:.1f}ms,"
+            f" p99 {quantiles[98] * 1000:.1f}ms"
+        )
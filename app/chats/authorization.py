@@ -0,0 +1,86 @@
+from channels.db import database_sync_to_async
+from django.db.models import Q
+from django.utils import timezone
+from core.redis import get_async_redis, get_redis
+from talks.models import Talk
+
+CONNECT_DENIED_TIMEOUT = 10
+
+
+def get_connect_authorization_key(talk_id):
+    return f"chats:connect:{talk_id}"
+
+
+def get_connect_denied_key(talk_id, user_id):
+    return f"chats:connect:{talk_id}:denied:{user_id}"
+
+
+@database_sync_to_async
+def get_connect_window_end(user_id, talk_id):
+    """
+    Return the end of the talk if the user may chat in it now, that is when
+    the event is published, the talk is ongoing, and the user attends the
+    event or speaks in the talk.
+    """
+    now = timezone.now()
+    return (
+        Talk.objects.filter(
+            Q(event__is_published=True)
+            & (Q(event__attendees=user_id) | Q(speaker=user_id))
+            & Q(pk=talk_id)
+            & Q(start__lte=now)
+            & Q(end__gte=now)
+        )
+        .values_list("end", flat=True)
+        .first()
+    )
+
+
+async def has_connect_permission(user, talk_id):
+    """
+    Return whether the user may connect to the chat of the talk. Granted
+    authorizations are kept in a hash per talk until the talk ends, and
+    denials for CONNECT_DENIED_TIMEOUT, so that reconnect storms are served
+    from Redis.
+    """
+    if user is None or not user.is_authenticated:
+        return False
+
+    redis = get_async_redis()
+    authorization_key = get_connect_authorization_key(talk_id)
+    denied_key = get_connect_denied_key(talk_id, user.pk)
+    pipeline = redis.pipeline()
+    pipeline.hexists(authorization_key, user.pk)
+    pipeline.exists(denied_key)
+    is_authorized, is_denied = await pipeline.execute()
+    if is_authorized:
+        return True
+    if is_denied:
+        return False
+
+    end = await get_connect_window_end(user.pk, talk_id)
+    if end is None:
+        await redis.set(denied_key, 1, ex=CONNECT_DENIED_TIMEOUT)
+        return False
+    pipeline = redis.pipeline()
+    pipeline.hset(authorization_key, user.pk, 1)
+    pipeline.expireat(authorization_key, end)
+    await pipeline.execute()
+    return True
+
+
+def revoke_connect_authorizations(talk_ids, user_ids=None):
+    """
+    Forget the authorizations of the users to connect to the chats of the
+    talks, or all of their authorizations when user_ids is None.
+    """
+    keys = [get_connect_authorization_key(talk_id) for talk_id in talk_ids]
+    if not keys:
+        return
+    if user_ids is None:
+        get_redis().delete(*keys)
+    elif user_ids:
+        pipeline = get_redis().pipeline()
+        for key in keys:
+            pipeline.hdel(key, *user_ids)
+        pipeline.execute()
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from weakref import WeakKeyDictionary
+from core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# The window over which the messages of a talk are coalesced, in seconds
+BATCH_WINDOW = 0.075
+# Like the groups of the channel layer, the subscribers of a batch group are
+# forgotten after a day.
+BATCH_SUBSCRIBERS_TIMEOUT = 24 * 60 * 60
+
+# Each event loop has its own batches, as their tasks belong to it
+_batchers = WeakKeyDictionary()
+
+
+class MessageBatcher:
+    """
+    Coalesce the chat_message events sent to each group over BATCH_WINDOW,
+    and send them with a single chat_messages event, so that a consumer of
+    the group gets one channel layer message per window.
+    """
+
+    def __init__(self):
+        self.batches = {}
+        self.tasks = set()
+
+    def add(self, channel_layer, group_name, event):
+        batch = self.batches.get(group_name)
+        if batch is not None:
+            batch.append(event)
+            return
+
+        self.batches[group_name] = [event]
+        task = asyncio.create_task(self.send_later(channel_layer, group_name))
+        # Keep a reference to the task until it is done
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def send_later(self, channel_layer, group_name):
+        await asyncio.sleep(BATCH_WINDOW)
+        events = self.batches.pop(group_name)
+        try:
+            await channel_layer.group_send(
+                group_name, {"type": "chat_messages", "messages": events}
+            )
+        except Exception:
+            logger.exception(
+                "Failed to send %d chat messages to %s",
+                len(events),
+                group_name,
+            )
+
+
+def get_batcher():
+    """Return the MessageBatcher of the running loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _batchers:
+        _batchers[loop] = MessageBatcher()
+    return _batchers[loop]
+
+
+def get_batch_subscribers_key(talk_id):
+    return f"chats:talk:{talk_id}:batch-subscribers"
+
+
+async def add_batch_subscriber(talk_id, channel_name):
+    key = get_batch_subscribers_key(talk_id)
+    pipeline = get_async_redis().pipeline()
+    pipeline.sadd(key, channel_name)
+    pipeline.expire(key, BATCH_SUBSCRIBERS_TIMEOUT)
+    await pipeline.execute()
+
+
+async def remove_batch_subscriber(talk_id, channel_name):
+    await get_async_redis().srem(
+        get_batch_subscribers_key(talk_id), channel_name
+    )
+
+
+async def has_batch_subscribers(talk_id):
+    """
+    Return whether a consumer of the talk receives batches, so that the
+    messages are only batched for the talks that have one.
+    """
+    return bool(
+        await get_async_redis().exists(get_batch_subscribers_key(talk_id))
+    )
@@ -1,56 +1,153 @@
 import json
+from urllib.parse import parse_qs
 
-from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
-from events.models import Event
-from django.db.models import Q
-from django.utils import timezone
+from talks.live import live_talks
+from .authorization import has_connect_permission
+from .batching import (
+    add_batch_subscriber,
+    get_batcher,
+    has_batch_subscribers,
+    remove_batch_subscriber,
+)
+from .limits import MESSAGE_MAX_SIZE, take_message_token, take_slow_mode_turn
+from .messages import (
+    append_message,
+    get_messages_since,
+    is_stream_id,
+    parse_stream_id,
+)
+
+
+# Clients that support batches of messages request this subprotocol, or
+# pass batch=true in the query string.
+BATCH_SUBPROTOCOL = "chat.batch"
 
 
 class ChatConsumer(AsyncWebsocketConsumer):
-    @database_sync_to_async
-    def has_connect_permission(self, user, talk_id):
-        return (
-            user is not None
-            and Event.objects.filter(
-                Q(is_published=True)
-                & (Q(attendees=user) | Q(talk__speaker=user))
-                & Q(talk__id=talk_id)
-                & Q(talk__start__lte=timezone.now())
-                & Q(talk__end__gte=timezone.now())
-            ).exists()
-        )
+    """
+    Broadcast the chat messages of a talk. Each message is sent in its own
+    frame, unless the client opts in to batches, then it gets a frame with
+    an array of the messages of each BATCH_WINDOW.
+    """
 
     async def connect(self):
         self.user = self.scope["user"]
-        self.talk_id = self.scope["url_route"]["kwargs"]["talk_id"]
-        self.group_name = f"talk_{self.talk_id}"
+        self.talk_id = int(self.scope["url_route"]["kwargs"]["talk_id"])
+        self.query_params = parse_qs(self.scope["query_string"].decode())
+        self.talk_group_name = f"talk_{self.talk_id}"
+        self.batch_group_name = f"talk_{self.talk_id}_batch"
+        self.has_joined = False
+        self.replayed_id = None
 
-        if not (await self.has_connect_permission(self.user, self.talk_id)):
+        if not (await has_connect_permission(self.user, self.talk_id)):
             await self.close()
+            return
+
+        subprotocol = None
+        if BATCH_SUBPROTOCOL in self.scope.get("subprotocols", []):
+            subprotocol = BATCH_SUBPROTOCOL
+        self.batch = subprotocol is not None or (
+            self.query_params.get("batch", [""])[0] == "true"
+        )
+        self.group_name = (
+            self.batch_group_name if self.batch else self.talk_group_name
+        )
 
+        await self.accept(subprotocol)
+        since = self.get_since()
+        if since is not None:
+            await self.replay_messages(since)
         await self.channel_layer.group_add(self.group_name, self.channel_name)
-        await self.accept()
+        if self.batch:
+            await add_batch_subscriber(self.talk_id, self.channel_name)
+        self.has_joined = True
+        if since is not None:
+            # Messages sent while joining are replayed as well, and they
+            # are skipped when they arrive from the group.
+            await self.replay_messages(self.replayed_id or since)
+
+    def get_since(self):
+        since = self.query_params.get("since", [""])[0]
+        return since if is_stream_id(since) else None
+
+    async def replay_messages(self, since):
+        events = await get_messages_since(self.talk_id, since)
+        await self.send_messages(events)
+        if events:
+            self.replayed_id = events[-1]["id"]
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.group_name, self.channel_name
-        )
+        if self.has_joined:
+            await self.channel_layer.group_discard(
+                self.group_name, self.channel_name
+            )
+            if self.batch:
+                await remove_batch_subscriber(self.talk_id, self.channel_name)
 
-    async def receive(self, text_data):
-        message = json.loads(text_data)["message"]
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                "type": "chat_message",
-                "username": self.user.username,
-                "message": message,
-            },
-        )
+    async def receive(self, text_data=None, bytes_data=None):
+        # Reject large frames before parsing them
+        if text_data is not None and len(text_data) > MESSAGE_MAX_SIZE:
+            await self.send_error("Message is too large.")
+            return
+        try:
+            message = json.loads(text_data)["message"]
+        except (ValueError, KeyError, TypeError):
+            message = None
+        # Postgres can't store NUL characters
+        if not isinstance(message, str) or "\x00" in message:
+            await self.send_error("Invalid message.")
+            return
 
-    async def chat_message(self, event):
-        await self.send(
-            text_data=json.dumps(
-                {"username": event["username"], "message": event["message"]}
+        if not await take_message_token(self.talk_id, self.user.pk):
+            await self.send_error("Too many messages.")
+            return
+        talk = await live_talks.aget(self.talk_id, consumer=True)
+        slow_mode = talk.slow_mode if talk is not None else 0
+        if not await take_slow_mode_turn(
+            self.talk_id, self.user.pk, slow_mode
+        ):
+            await self.send_error(
+                f"Slow mode is on, wait {slow_mode} seconds between messages."
             )
-        )
+            return
+
+        event = await append_message(self.talk_id, self.user, message)
+        await self.channel_layer.group_send(self.talk_group_name, event)
+        if await has_batch_subscribers(self.talk_id):
+            get_batcher().add(self.channel_layer, self.batch_group_name, event)
+
+    async def send_error(self, error):
+        await self.send(text_data=json.dumps({"error": error}))
+
+    async def chat_message(self, event):
+        await self.send_messages(self.skip_replayed([event]))
+
+    async def chat_messages(self, event):
+        await self.send_messages(self.skip_replayed(event["messages"]))
+
+    def skip_replayed(self, events):
+        if self.replayed_id is None:
+            return events
+        replayed_id = parse_stream_id(self.replayed_id)
+        return [
+            event
+            for event in events
+            if parse_stream_id(event["id"]) > replayed_id
+        ]
+
+    async def send_messages(self, events):
+        messages = [
+            {
+                "id": event["id"],
+                "username": event["username"],
+                "message": event["message"],
+            }
+            for event in events
+        ]
+        if self.batch:
+            if messages:
+                await self.send(text_data=json.dumps(messages))
+        else:
+            for message in messages:
+                await self.send(text_data=json.dumps(message))
@@ -0,0 +1,67 @@
+from redis.commands.core import AsyncScript
+from core.redis import get_async_redis
+
+# The largest text frame that is parsed, in characters
+MESSAGE_MAX_SIZE = 2000
+# A user can send bursts of up to BUCKET_CAPACITY messages in a talk, then
+# BUCKET_REFILL_RATE messages per second.
+BUCKET_CAPACITY = 5
+BUCKET_REFILL_RATE = 1
+
+# Refill the bucket for the time elapsed since it was last updated, then
+# take a token from it if there is one, and return whether there was. The
+# time is the one of the Redis server, which is shared by the ASGI hosts.
+TAKE_TOKEN_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(
+    capacity, tokens + math.max(0, now - updated_at) * refill_rate
+)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / refill_rate) + 1)
+return allowed
+"""
+# Run with the client of the running loop, see take_message_token
+take_token_script = AsyncScript(None, TAKE_TOKEN_SCRIPT.encode())
+
+
+def get_bucket_key(talk_id, user_id):
+    return f"chats:talk:{talk_id}:bucket:{user_id}"
+
+
+def get_slow_mode_key(talk_id, user_id):
+    return f"chats:talk:{talk_id}:slow:{user_id}"
+
+
+async def take_message_token(talk_id, user_id):
+    """Return whether the token bucket of the user allows a message."""
+    allowed = await take_token_script(
+        keys=[get_bucket_key(talk_id, user_id)],
+        args=[BUCKET_CAPACITY, BUCKET_REFILL_RATE],
+        client=get_async_redis(),
+    )
+    return allowed == 1
+
+
+async def take_slow_mode_turn(talk_id, user_id, slow_mode):
+    """
+    Return whether the user may send a message in a talk in slow mode, that
+    is whether slow_mode seconds passed since the last message of the user.
+    """
+    if not slow_mode:
+        return True
+    return bool(
+        await get_async_redis().set(
+            get_slow_mode_key(talk_id, user_id), 1, nx=True, ex=slow_mode
+        )
+    )
@@ -0,0 +1,38 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from chats.messages import FLUSH_BATCH_SIZE, FLUSH_INTERVAL, flush_messages
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the chat messages from the Redis streams to Postgres in"
+        " batches, every interval seconds or as soon as a batch is full."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=FLUSH_INTERVAL)
+        parser.add_argument("--batch-size", type=int, default=FLUSH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            started_at = time.monotonic()
+            try:
+                count = flush_messages(options["batch_size"])
+            except Exception:
+                # The messages stay in the streams until the flush succeeds
+                logger.exception("Failed to flush chat messages")
+                close_old_connections()
+                count = 0
+            if count:
+                logger.info("Flushed %d chat messages", count)
+            if count < options["batch_size"]:
+                time.sleep(
+                    max(
+                        0,
+                        options["interval"] - (time.monotonic() - started_at),
+                    )
+                )
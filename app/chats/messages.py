@@ -0,0 +1,265 @@
+import logging
+import re
+from datetime import datetime, timezone
+from django.db import DataError, IntegrityError, transaction
+from redis.commands.core import AsyncScript
+from core.redis import get_async_redis, get_redis
+from talks.models import Talk
+from users.models import User
+from .models import Message
+
+logger = logging.getLogger(__name__)
+
+PENDING_TALKS_KEY = "chats:messages:pending"
+# The messages that Postgres refused are set aside in this stream
+REJECTED_MESSAGES_KEY = "chats:messages:rejected"
+REJECTED_MESSAGES_MAXLEN = 10000
+FLUSH_BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.25
+# The messages stream of a talk keeps about its last MESSAGES_MAXLEN
+# messages for reconnecting clients. The messages wait for flush_messages
+# in the pending stream of the talk, which is only trimmed once they are
+# written to Postgres.
+MESSAGES_MAXLEN = 1000
+MESSAGES_TIMEOUT = 24 * 60 * 60
+
+STREAM_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+# Append the message to the pending stream, then to the capped messages
+# stream with the same id, and return the id.
+APPEND_MESSAGE_SCRIPT = """
+local id = redis.call(
+    "XADD", KEYS[1], "*",
+    "user", ARGV[1], "username", ARGV[2], "message", ARGV[3]
+)
+redis.call(
+    "XADD", KEYS[2], "MAXLEN", "~", ARGV[4], id,
+    "user", ARGV[1], "username", ARGV[2], "message", ARGV[3]
+)
+redis.call("EXPIRE", KEYS[2], ARGV[5])
+redis.call("SADD", KEYS[3], ARGV[6])
+return id
+"""
+# Run with the client of the running loop, see append_message
+append_message_script = AsyncScript(None, APPEND_MESSAGE_SCRIPT.encode())
+
+
+def get_messages_key(talk_id):
+    return f"chats:talk:{talk_id}:messages"
+
+
+def get_pending_messages_key(talk_id):
+    return f"chats:talk:{talk_id}:pending"
+
+
+def get_flushed_id_key(talk_id):
+    return f"chats:talk:{talk_id}:flushed"
+
+
+def is_stream_id(value):
+    return bool(STREAM_ID_PATTERN.match(value))
+
+
+def parse_stream_id(stream_id):
+    """Return the stream id "milliseconds-seq" as a comparable tuple."""
+    milliseconds, sequence = stream_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+def get_next_stream_id(stream_id):
+    """Return the smallest stream id after stream_id."""
+    milliseconds, sequence = parse_stream_id(stream_id)
+    return f"{milliseconds}-{sequence + 1}"
+
+
+def get_stream_id_datetime(stream_id):
+    """Return when Redis added the entry with the id "milliseconds-seq"."""
+    milliseconds, _sequence = parse_stream_id(stream_id)
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
+
+
+def get_message_event(stream_id, fields):
+    """Return the chat_message event of an entry of the stream."""
+    return {
+        "type": "chat_message",
+        "id": stream_id.decode(),
+        "username": fields[b"username"].decode(),
+        "message": fields[b"message"].decode(),
+    }
+
+
+async def append_message(talk_id, user, message):
+    """
+    Append the message to the streams of the talk, to be replayed to
+    reconnecting clients and written to Postgres by flush_messages, and
+    return its chat_message event.
+    """
+    stream_id = await append_message_script(
+        keys=[
+            get_pending_messages_key(talk_id),
+            get_messages_key(talk_id),
+            PENDING_TALKS_KEY,
+        ],
+        args=[
+            user.pk,
+            user.username,
+            message,
+            MESSAGES_MAXLEN,
+            MESSAGES_TIMEOUT,
+            talk_id,
+        ],
+        client=get_async_redis(),
+    )
+    return {
+        "type": "chat_message",
+        "id": stream_id.decode(),
+        "username": user.username,
+        "message": message,
+    }
+
+
+async def get_messages_since(talk_id, since):
+    """Return the chat_message events after the stream id since."""
+    entries = await get_async_redis().xrange(
+        get_messages_key(talk_id), min=f"({since}"
+    )
+    return [
+        get_message_event(stream_id, fields) for stream_id, fields in entries
+    ]
+
+
+def insert_messages(messages):
+    """
+    Insert the messages with one bulk insert. If Postgres refuses one of
+    them, insert them one by one instead, and set aside the refused ones in
+    the rejected messages stream, so that they don't block the others.
+    """
+    try:
+        with transaction.atomic():
+            Message.objects.bulk_create(messages, ignore_conflicts=True)
+        return
+    except (DataError, IntegrityError, ValueError):
+        logger.exception("Failed to insert a batch of chat messages")
+
+    for message in messages:
+        try:
+            with transaction.atomic():
+                Message.objects.bulk_create([message], ignore_conflicts=True)
+        except (DataError, IntegrityError, ValueError):
+            logger.exception(
+                "Set aside the chat message %s of talk %d",
+                message.stream_id,
+                message.talk_id,
+            )
+            get_redis().xadd(
+                REJECTED_MESSAGES_KEY,
+                {
+                    "talk": message.talk_id,
+                    "user": message.user_id,
+                    "message": message.message,
+                    "stream_id": message.stream_id,
+                },
+                maxlen=REJECTED_MESSAGES_MAXLEN,
+                approximate=True,
+            )
+
+
+def flush_messages(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Write up to batch_size unflushed messages of each talk to Postgres with
+    one bulk insert, then move the flushed id of the talks past them and
+    trim them from the pending streams, and return how many were read.
+    Messages are inserted at most once per stream id, so a flush that fails
+    after the insert is safe to retry.
+    """
+    redis = get_redis()
+    talk_ids = sorted(
+        int(talk_id) for talk_id in redis.smembers(PENDING_TALKS_KEY)
+    )
+    if not talk_ids:
+        return 0
+
+    flushed_ids = redis.mget(
+        [get_flushed_id_key(talk_id) for talk_id in talk_ids]
+    )
+    streams = redis.xread(
+        {
+            get_pending_messages_key(talk_id): flushed_id or 0
+            for talk_id, flushed_id in zip(talk_ids, flushed_ids)
+        },
+        count=batch_size,
+    )
+    entries = {
+        int(key.decode().split(":")[2]): [
+            (stream_id.decode(), fields) for stream_id, fields in stream
+        ]
+        for key, stream in streams
+    }
+    user_ids = {
+        int(fields[b"user"])
+        for talk_entries in entries.values()
+        for _stream_id, fields in talk_entries
+    }
+    # Messages of deleted talks and users are dropped
+    existing_talk_ids = set(
+        Talk.objects.filter(pk__in=entries).values_list("pk", flat=True)
+    )
+    existing_user_ids = set(
+        User.objects.filter(pk__in=user_ids).values_list("pk", flat=True)
+    )
+    insert_messages(
+        [
+            Message(
+                talk_id=talk_id,
+                user_id=int(fields[b"user"]),
+                message=fields[b"message"].decode(),
+                stream_id=stream_id,
+                created_at=get_stream_id_datetime(stream_id),
+            )
+            for talk_id, talk_entries in entries.items()
+            if talk_id in existing_talk_ids
+            for stream_id, fields in talk_entries
+            if int(fields[b"user"]) in existing_user_ids
+        ]
+    )
+
+    pipeline = redis.pipeline()
+    for talk_id, talk_entries in entries.items():
+        flushed_id = talk_entries[-1][0]
+        pipeline.set(
+            get_flushed_id_key(talk_id), flushed_id, ex=MESSAGES_TIMEOUT
+        )
+        pipeline.xtrim(
+            get_pending_messages_key(talk_id),
+            minid=get_next_stream_id(flushed_id),
+        )
+    pipeline.execute()
+
+    # Stop reading the drained streams, unless messages were appended since
+    drained_talk_ids = [
+        talk_id
+        for talk_id in talk_ids
+        if len(entries.get(talk_id, [])) < batch_size
+    ]
+    if drained_talk_ids:
+        redis.srem(PENDING_TALKS_KEY, *drained_talk_ids)
+        flushed_ids = redis.mget(
+            [get_flushed_id_key(talk_id) for talk_id in drained_talk_ids]
+        )
+        pipeline = redis.pipeline()
+        for talk_id, flushed_id in zip(drained_talk_ids, flushed_ids):
+            pipeline.xrange(
+                get_pending_messages_key(talk_id),
+                min=f"({flushed_id.decode()}" if flushed_id else "-",
+                count=1,
+            )
+        appended = pipeline.execute()
+        pending_talk_ids = [
+            talk_id
+            for talk_id, talk_entries in zip(drained_talk_ids, appended)
+            if talk_entries
+        ]
+        if pending_talk_ids:
+            redis.sadd(PENDING_TALKS_KEY, *pending_talk_ids)
+
+    return sum(len(talk_entries) for talk_entries in entries.values())
@@ -0,0 +1,24 @@
+from django.db import models
+from talks.models import Talk
+from users.models import User
+
+
+class Message(models.Model):
+    talk = models.ForeignKey(
+        Talk, on_delete=models.CASCADE, related_name="messages"
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    message = models.TextField()
+    # The id of the message in the Redis stream of the talk
+    stream_id = models.CharField(max_length=32)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["talk", "id"], name="message_talk_id_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["talk", "stream_id"], name="message_unique_stream_id"
+            ),
+        ]
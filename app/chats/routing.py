@@ -4,6 +4,6 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(
-        r"ws/chats/talks/(?P<talk_id>\w+)/$", consumers.ChatConsumer.as_asgi()
+        r"ws/chats/talks/(?P<talk_id>\d+)/$", consumers.ChatConsumer.as_asgi()
     ),
 ]
@@ -0,0 +1,48 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from events.models import Event
+from talks.models import Talk
+from .authorization import revoke_connect_authorizations
+
+
+@receiver(post_save, sender=Talk)
+@receiver(post_delete, sender=Talk)
+def post_save_delete_talk_revoke_connect_authorizations(
+    sender, instance, **kwargs
+):
+    revoke_connect_authorizations([instance.pk])
+
+
+@receiver(post_save, sender=Event)
+def post_save_event_revoke_connect_authorizations(
+    sender, instance, created, **kwargs
+):
+    if not created and not instance.is_published:
+        revoke_connect_authorizations(
+            instance.talk_set.values_list("pk", flat=True)
+        )
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def m2m_changed_event_attendees_revoke_connect_authorizations(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear":
+        # The cleared attendees or events are not known afterwards
+        if reverse:
+            pk_set = set(instance.booked_events.values_list("pk", flat=True))
+        else:
+            pk_set = set(instance.attendees.values_list("pk", flat=True))
+    elif action != "post_remove":
+        return
+
+    if reverse:
+        event_ids, user_ids = pk_set, [instance.pk]
+    else:
+        event_ids, user_ids = [instance.pk], pk_set
+    revoke_connect_authorizations(
+        Talk.objects.filter(event_id__in=event_ids).values_list(
+            "pk", flat=True
+        ),
+        user_ids,
+    )
@@ -0,0 +1,27 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def get_etag(*parts):
+    value = ":".join(str(part) for part in parts)
+    return quote_etag(hashlib.sha256(value.encode("utf-8")).hexdigest())
+
+
+def conditional_response(request, last_modified, etag_parts, get_response):
+    """
+    Answer If-None-Match and If-Modified-Since with 304 when the resource
+    version is unchanged, without calling get_response to build the body.
+    """
+    etag = get_etag(*etag_parts, last_modified.isoformat())
+    last_modified = int(last_modified.timestamp())
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = get_response()
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_vary_headers(response, ["Authorization"])
+    return response
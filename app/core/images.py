@@ -0,0 +1,92 @@
+import os
+from io import BytesIO
+from django.db import transaction
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# name: (size, format), a format of None keeps the format of the original
+IMAGE_VARIANTS = {
+    "thumbnail": ((320, 320), None),
+    "thumbnail_webp": ((320, 320), "WEBP"),
+    "webp": (None, "WEBP"),
+}
+
+EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+
+def get_variant_name(name, variant, image_format):
+    directory, filename = os.path.split(name)
+    stem, _ = os.path.splitext(filename)
+    extension = EXTENSIONS.get(image_format, image_format.lower())
+    return os.path.join(directory, "variants", f"{stem}_{variant}.{extension}")
+
+
+def generate_image_variants(name, storage=default_storage):
+    """
+    Generate the IMAGE_VARIANTS of the image stored with the given name,
+    and return a dict that maps each variant to its storage name.
+    """
+    with storage.open(name) as file:
+        original = Image.open(file)
+        original_format = original.format
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    variants = {}
+    for variant, (size, image_format) in IMAGE_VARIANTS.items():
+        image_format = image_format or original_format
+        image = original.copy()
+        if size is not None:
+            image.thumbnail(size)
+        if image_format == "JPEG" and image.mode not in ["RGB", "L"]:
+            image = image.convert("RGB")
+
+        content = BytesIO()
+        image.save(content, format=image_format, quality=80)
+        variant_name = get_variant_name(name, variant, image_format)
+        if storage.exists(variant_name):
+            storage.delete(variant_name)
+        variants[variant] = storage.save(
+            variant_name, ContentFile(content.getvalue())
+        )
+    return variants
+
+
+def get_image_variant_urls(field_file, variants, storage=default_storage):
+    """
+    Return the URL of each variant, falling back to the original image
+    until the variants are generated.
+    """
+    if not field_file:
+        return None
+    return {
+        variant: storage.url(variants[variant])
+        if variant in variants
+        else field_file.url
+        for variant in IMAGE_VARIANTS
+    }
+
+
+def reset_image_variants(instance, field_name):
+    """
+    Clear the variants of a changed image before the instance is saved, and
+    remember to generate the new ones once it is.
+    """
+    field_file = getattr(instance, field_name)
+    if not field_file or not field_file._committed:
+        setattr(instance, f"{field_name}_variants", {})
+    uploaded = bool(field_file) and not field_file._committed
+    setattr(instance, f"_{field_name}_uploaded", uploaded)
+
+
+def schedule_image_variants(instance, field_name):
+    from .tasks import generate_image_variants_task
+
+    if getattr(instance, f"_{field_name}_uploaded", False):
+        setattr(instance, f"_{field_name}_uploaded", False)
+        transaction.on_commit(
+            lambda: generate_image_variants_task.delay(
+                instance._meta.label, instance.pk, field_name
+            )
+        )
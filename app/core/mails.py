@@ -0,0 +1,130 @@
+import json
+from .redis import get_redis
+
+PENDING_MAILS_KEY = "mails:pending"
+# The mails taken by a sender stay in this list until they are sent
+PROCESSING_MAILS_KEY = "mails:processing"
+FLUSH_SCHEDULED_KEY = "mails:flush-scheduled"
+SENDING_LOCK_KEY = "mails:sending"
+SENDING_LOCK_TIMEOUT = 5 * 60
+# Gather the mails of a spike before opening a connection for them
+FLUSH_COUNTDOWN = 5
+MAIL_BATCH_SIZE = 100
+MAIL_MAX_ATTEMPTS = 3
+MAIL_RETRY_COUNTDOWN = 60
+
+
+def queue_mails(messages, countdown=FLUSH_COUNTDOWN):
+    """
+    Queue (subject, message, recipient_list) messages, and make sure a
+    send_pending_mails_task will send them.
+    """
+    if not messages:
+        return
+    client = get_redis()
+    client.rpush(
+        PENDING_MAILS_KEY,
+        *[
+            json.dumps(
+                {
+                    "subject": subject,
+                    "message": message,
+                    "recipient_list": recipient_list,
+                    "attempts": 0,
+                }
+            )
+            for subject, message, recipient_list in messages
+        ],
+    )
+    schedule_pending_mails(countdown)
+
+
+def queue_mail(subject, message, recipient_list):
+    queue_mails([(subject, message, recipient_list)])
+
+
+def schedule_pending_mails(countdown):
+    from .tasks import send_pending_mails_task
+
+    # A single task is scheduled at a time, the flag expires in case it is
+    # lost before it runs
+    if get_redis().set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=countdown + 5 * 60):
+        send_pending_mails_task.apply_async(countdown=countdown)
+
+
+def clear_scheduled_pending_mails():
+    get_redis().delete(FLUSH_SCHEDULED_KEY)
+
+
+def pop_pending_mails(count=MAIL_BATCH_SIZE):
+    mails = get_redis().lpop(PENDING_MAILS_KEY, count) or []
+    return [json.loads(mail) for mail in mails]
+
+
+def requeue_mails(mails):
+    get_redis().rpush(PENDING_MAILS_KEY, *[json.dumps(m) for m in mails])
+
+
+def acquire_sending_lock():
+    """
+    Return whether the caller may send the queued mails, that is whether no
+    other sender is running. The lock expires in case its sender is killed.
+    """
+    return bool(
+        get_redis().set(SENDING_LOCK_KEY, 1, nx=True, ex=SENDING_LOCK_TIMEOUT)
+    )
+
+
+def extend_sending_lock():
+    get_redis().expire(SENDING_LOCK_KEY, SENDING_LOCK_TIMEOUT)
+
+
+def release_sending_lock():
+    get_redis().delete(SENDING_LOCK_KEY)
+
+
+def recover_processing_mails():
+    """
+    Queue again, in front of the queue, the mails that a sender took but
+    did not finish because it was killed. Only the holder of the sending
+    lock may call this.
+    """
+    client = get_redis()
+    recovered = 0
+    while client.lmove(
+        PROCESSING_MAILS_KEY, PENDING_MAILS_KEY, "RIGHT", "LEFT"
+    ):
+        recovered += 1
+    return recovered
+
+
+def take_pending_mails(count=MAIL_BATCH_SIZE):
+    """
+    Move up to count mails from the queue to the processing list, and
+    return them as (payload, mail) pairs. The payload identifies the mail
+    for finish_mail.
+    """
+    pipeline = get_redis().pipeline()
+    for _ in range(count):
+        pipeline.lmove(
+            PENDING_MAILS_KEY, PROCESSING_MAILS_KEY, "LEFT", "RIGHT"
+        )
+    payloads = [payload for payload in pipeline.execute() if payload]
+    return [(payload, json.loads(payload)) for payload in payloads]
+
+
+def finish_mail(payload):
+    """Remove a sent or dropped mail from the processing list."""
+    get_redis().lrem(PROCESSING_MAILS_KEY, 1, payload)
+
+
+def retry_mails(payloads, mails):
+    """
+    Move the mails of payloads from the processing list back to the queue,
+    as the updated mails.
+    """
+    pipeline = get_redis().pipeline()
+    pipeline.rpush(PENDING_MAILS_KEY, *[json.dumps(m) for m in mails])
+    for payload in payloads:
+        pipeline.lrem(PROCESSING_MAILS_KEY, 1, payload)
+    pipeline.execute()
@@ -1,7 +1,8 @@
 from django.contrib.auth.models import AnonymousUser
 from channels.db import database_sync_to_async
-from users.models import ChatKey
-from .utils import ModelPluggableTokenAuthentication
+from rest_framework import exceptions
+from users.keys import get_key_user_id
+from users.models import User
 
 
 @database_sync_to_async
@@ -9,10 +10,11 @@ def get_user(token):
     if token is None:
         return AnonymousUser()
     else:
-        knox_auth = ModelPluggableTokenAuthentication()
-        knox_auth.model = ChatKey
-        user, _ = knox_auth.authenticate_credentials(token)
-        return user
+        user_id = get_key_user_id(token, "chat")
+        try:
+            return User.objects.get(pk=user_id, is_active=True)
+        except User.DoesNotExist:
+            raise exceptions.AuthenticationFailed()
 
 
 class TokenAuthMiddleware:
@@ -23,6 +25,6 @@ class TokenAuthMiddleware:
         query_params = dict(
             (x.split("=") for x in scope["query_string"].decode().split("&"))
         )
-        token = query_params.get("token", "").encode("utf-8")
+        token = query_params.get("token", "")
         scope["user"] = await get_user(token)
         return await self.app(scope, receive, send)
@@ -0,0 +1,29 @@
+import asyncio
+from functools import lru_cache
+from weakref import WeakKeyDictionary
+import redis
+import redis.asyncio
+from django.conf import settings
+
+# The clients of redis.asyncio belong to the event loop they are used in
+_async_clients = WeakKeyDictionary()
+
+
+@lru_cache(maxsize=None)
+def get_redis_client(url):
+    return redis.Redis.from_url(url)
+
+
+def get_redis():
+    """Return a client of the Redis server that backs the cache."""
+    return get_redis_client(settings.REDIS_URL)
+
+
+def get_async_redis():
+    """Return an asyncio client of the Redis server for the running loop."""
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    if settings.REDIS_URL not in clients:
+        clients[settings.REDIS_URL] = redis.asyncio.Redis.from_url(
+            settings.REDIS_URL
+        )
+    return clients[settings.REDIS_URL]
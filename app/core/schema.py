@@ -5,6 +5,7 @@ from knox.settings import knox_settings
 
 class KnoxTokenAuthenticationScheme(OpenApiAuthenticationExtension):
     target_class = "knox.auth.TokenAuthentication"
+    match_subclasses = True
     name = "tokenAuth"
 
     def get_security_definition(self, auto_schema):
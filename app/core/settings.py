@@ -17,7 +17,8 @@ from datetime import timedelta
 
 env = environ.Env(
     # set casting, default value
-    DJANGO_DEBUG=(bool, False)
+    DJANGO_DEBUG=(bool, False),
+    DJANGO_SIGNED_KEYS=(bool, True),
 )
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -57,6 +58,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 MIDDLEWARE = [
@@ -157,8 +159,23 @@ STATIC_URL = "storage/static/"
 STATIC_ROOT = BASE_DIR / "storage/static"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": ("knox.auth.TokenAuthentication",),
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "core.utils.CachedTokenAuthentication",
+    ),
     "PAGE_SIZE": 20,
+    # The clients are identified by the address that the reverse proxy
+    # appends to X-Forwarded-For, since the rest of the header is sent by
+    # the clients themselves
+    "NUM_PROXIES": 1,
+    # Used by the throttles of core.throttling, with the throttle_scope of a
+    # view and a _user or _ip suffix
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "10/min",
+        "register_ip": "10/hour",
+        "verification_ip": "5/hour",
+        "keys_user": "30/min",
+        "keys_ip": "600/min",
+    },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -170,25 +187,35 @@ SPECTACULAR_SETTINGS = {
 
 REST_KNOX = {"AUTH_HEADER_PREFIX": "Bearer"}
 
+# Sign the chat and play-stream keys instead of storing them as knox tokens
+SIGNED_KEYS = env("DJANGO_SIGNED_KEYS")
+
 CORS_ALLOWED_ORIGINS = env("DJANGO_CORS_ALLOWED_ORIGINS", default="").split()
 COSS_ALLOWED_HEADERS = ["Content-Type", "Origin", "Accept"]
 
 CSRF_TRUSTED_ORIGINS = env("DJANGO_CSRF_TRUSTED_ORIGINS", default="").split()
 
+REDIS_HOST = env("REDIS_HOST", default=None)
+REDIS_PORT = env("REDIS_PORT", default=None)
+REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}"
+
 ASGI_APPLICATION = "core.asgi.application"
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
-            "hosts": [
-                (
-                    env("REDIS_HOST", default=None),
-                    env("REDIS_PORT", default=None),
-                )
-            ],
+            "hosts": [(REDIS_HOST, REDIS_PORT)],
         },
     },
 }
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    },
+}
+
 SECURE_CROSS_ORIGIN_OPENER_POLICY = None
 
 FRONTEND_VERIFY_EMAIL_URL = env("FRONTEND_VERIFY_EMAIL_URL", default=None)
@@ -202,9 +229,13 @@ EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default=None)
 
 CELERY_CONF_BROKER_URL = env("CELERY_BROKER_URL", default=None)
 CELERY_CONF_BEAT_SCHEDULE = {
-    "clean_expired_tokens_every_day": {
+    "clean_expired_tokens": {
         "task": "users__clean_expired_tokens",
-        "schedule": timedelta(days=1),
+        "schedule": timedelta(minutes=15),
+    },
+    "rollup_viewers": {
+        "task": "talks__rollup_viewers",
+        "schedule": timedelta(minutes=1),
     },
 }
 
@@ -1,14 +1,107 @@
-from django.core.mail import send_mail
+import logging
+from django.apps import apps
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
+from django.utils import timezone
 from celery import shared_task
+from .images import generate_image_variants
+from .mails import (
+    FLUSH_COUNTDOWN,
+    MAIL_MAX_ATTEMPTS,
+    MAIL_RETRY_COUNTDOWN,
+    acquire_sending_lock,
+    clear_scheduled_pending_mails,
+    extend_sending_lock,
+    finish_mail,
+    queue_mail,
+    recover_processing_mails,
+    release_sending_lock,
+    retry_mails,
+    schedule_pending_mails,
+    take_pending_mails,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task
 def send_mail_task(subject, message, recipient_list):
-    send_mail(
-        subject,
-        message,
-        settings.EMAIL_HOST_USER,
-        recipient_list,
-        html_message=message,
+    """
+    Queue a mail sent with the former task, for the messages still in the
+    broker. To be removed in the next release.
+    """
+    queue_mail(subject, message, recipient_list)
+
+
+@shared_task
+def send_pending_mails_task():
+    """
+    Send the queued mails batch by batch over one SMTP connection. A mail
+    that fails is queued again until it runs out of attempts. The mails
+    being sent are kept in a processing list, so that the mails of a killed
+    sender are queued again by the next one.
+    """
+    clear_scheduled_pending_mails()
+    if not acquire_sending_lock():
+        # Check again once the running sender is done
+        schedule_pending_mails(FLUSH_COUNTDOWN)
+        return {"sent": 0, "failed": 0}
+
+    recovered = recover_processing_mails()
+    if recovered:
+        logger.warning("Queued %d unfinished mails again", recovered)
+
+    sent, failed_payloads, failed = 0, [], []
+    connection = get_connection()
+    try:
+        while mails := take_pending_mails():
+            extend_sending_lock()
+            for payload, mail in mails:
+                email = EmailMultiAlternatives(
+                    mail["subject"],
+                    mail["message"],
+                    settings.EMAIL_HOST_USER,
+                    mail["recipient_list"],
+                )
+                email.attach_alternative(mail["message"], "text/html")
+                try:
+                    # Opens the connection unless it is already open
+                    connection.open()
+                    connection.send_messages([email])
+                    sent += 1
+                except Exception:
+                    connection.close()
+                    mail["attempts"] += 1
+                    if mail["attempts"] < MAIL_MAX_ATTEMPTS:
+                        # Kept in the processing list until the end
+                        failed_payloads.append(payload)
+                        failed.append(mail)
+                        continue
+                    logger.exception(
+                        "Dropped mail to %s", mail["recipient_list"]
+                    )
+                finish_mail(payload)
+
+        if failed:
+            retry_mails(failed_payloads, failed)
+            schedule_pending_mails(MAIL_RETRY_COUNTDOWN)
+    finally:
+        connection.close()
+        release_sending_lock()
+
+    return {"sent": sent, "failed": len(failed)}
+
+
+@shared_task
+def generate_image_variants_task(model_label, pk, field_name):
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not getattr(instance, field_name):
+        return
+
+    name = getattr(instance, field_name).name
+    variants = generate_image_variants(name)
+    # The image may have been replaced while the variants were generated
+    model.objects.filter(pk=pk, **{field_name: name}).update(
+        **{f"{field_name}_variants": variants, "updated_at": timezone.now()}
     )
@@ -0,0 +1,154 @@
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Count the requests of the current and previous fixed windows, and
+    estimate the requests of the sliding window by weighting the previous
+    count by its overlap with the sliding window. Each request costs one
+    atomic increment, whatever the rate.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    # The window counter of the last allowed request, for rollback
+    counted_key = None
+
+    def get_rate(self):
+        # Read the rates on every call so that they follow setting changes
+        self.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+        return super().get_rate()
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+        current_key = f"{self.key}:{window}"
+        previous_key = f"{self.key}:{window - 1}"
+
+        self.cache.add(current_key, 0, timeout=self.duration * 2)
+        self.current_count = self.cache.incr(current_key)
+        self.previous_count = self.cache.get(previous_key, 0)
+        weight = 1 - self.elapsed / self.duration
+        if self.previous_count * weight + self.current_count > (
+            self.num_requests
+        ):
+            # Rejected requests don't count against the client
+            self.current_count = self.cache.decr(current_key)
+            return self.throttle_failure()
+        self.counted_key = current_key
+        return self.throttle_success()
+
+    def rollback(self):
+        """Stop counting the last allowed request, if it was counted."""
+        if self.counted_key is not None:
+            self.cache.decr(self.counted_key)
+            self.counted_key = None
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Return the seconds until the sliding window estimate leaves room for
+        one more request.
+        """
+        allowed = self.num_requests - 1
+        if self.current_count <= allowed and self.previous_count:
+            # The previous window has to slide out of the way
+            overlap = (allowed - self.current_count) / self.previous_count
+            return max(self.duration * (1 - overlap) - self.elapsed, 0)
+
+        # The current window has to end, then slide out of the way
+        overlap = allowed / self.current_count if self.current_count else 0
+        return self.duration - self.elapsed + self.duration * (1 - overlap)
+
+
+class ScopedSlidingWindowRateThrottle(SlidingWindowRateThrottle):
+    """
+    Throttle the views that set a throttle_scope, with the rate of the
+    "<throttle_scope>_<scope_suffix>" scope. Views without a rate for that
+    scope are not throttled.
+    """
+
+    scope_attr = "throttle_scope"
+    scope_suffix = None
+
+    def __init__(self):
+        # The rate depends on the view, like in ScopedRateThrottle
+        pass
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, self.scope_attr, None)
+        if not view_scope:
+            return True
+
+        self.scope = f"{view_scope}_{self.scope_suffix}"
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        if self.scope not in rates:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+
+class UserScopedRateThrottle(ScopedSlidingWindowRateThrottle):
+    """Throttle the authenticated users of a view, each on its own."""
+
+    scope_suffix = "user"
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": request.user.pk,
+        }
+
+
+class IPScopedRateThrottle(ScopedSlidingWindowRateThrottle):
+    """Throttle the clients of a view by their IP address."""
+
+    scope_suffix = "ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class RollbackThrottlesMixin:
+    """
+    Check the throttles of a view like APIView, but roll back the requests
+    counted by the throttles that allowed a request another throttle
+    rejected, so that rejected requests don't count against any scope.
+    """
+
+    def check_throttles(self, request):
+        allowed_throttles = []
+        throttle_durations = []
+        for throttle in self.get_throttles():
+            if throttle.allow_request(request, self):
+                allowed_throttles.append(throttle)
+            else:
+                throttle_durations.append(throttle.wait())
+
+        if throttle_durations:
+            for throttle in allowed_throttles:
+                if isinstance(throttle, SlidingWindowRateThrottle):
+                    throttle.rollback()
+            durations = [
+                duration
+                for duration in throttle_durations
+                if duration is not None
+            ]
+            self.throttled(request, max(durations, default=None))
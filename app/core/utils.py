@@ -1,4 +1,7 @@
 import binascii
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions
 from knox.auth import TokenAuthentication
@@ -26,3 +29,74 @@ class ModelPluggableTokenAuthentication(TokenAuthentication):
                     self.renew_token(auth_token)
                 return self.validate_user(auth_token)
         raise exceptions.AuthenticationFailed(msg)
+
+
+TOKEN_CACHE_TIMEOUT = 60
+
+
+def get_token_cache_key(model, digest):
+    return f"auth:{model._meta.label_lower}:{digest}"
+
+
+def invalidate_cached_token(auth_token):
+    cache.delete(get_token_cache_key(type(auth_token), auth_token.digest))
+
+
+class CachedTokenAuthentication(ModelPluggableTokenAuthentication):
+    """
+    Remember the user id and expiry of verified tokens for a short while,
+    so that an authenticated request only has to load its user.
+    Deleting a token invalidates its cache entry.
+    """
+
+    def authenticate_credentials(self, token):
+        try:
+            digest = hash_token(token.decode("utf-8"))
+        except (TypeError, binascii.Error, UnicodeDecodeError):
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        key = get_token_cache_key(self.model, digest)
+        cached = cache.get(key)
+        if cached is not None:
+            user_id, expiry = cached
+            if expiry is None or expiry > timezone.now():
+                return self.validate_cached_token(
+                    token, digest, user_id, expiry
+                )
+            cache.delete(key)
+
+        user, auth_token = super().authenticate_credentials(token)
+        self.cache_token(auth_token)
+        return user, auth_token
+
+    def validate_cached_token(self, token, digest, user_id, expiry):
+        try:
+            user = get_user_model().objects.get(pk=user_id)
+        except get_user_model().DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        auth_token = self.model(
+            digest=digest,
+            token_key=token[: CONSTANTS.TOKEN_KEY_LENGTH].decode("utf-8"),
+            user=user,
+            expiry=expiry,
+        )
+        auth_token.pk = digest
+        auth_token._state.adding = False
+        auth_token._state.db = self.model.objects.db
+        if knox_settings.AUTO_REFRESH and auth_token.expiry:
+            self.renew_token(auth_token)
+            self.cache_token(auth_token)
+        return self.validate_user(auth_token)
+
+    def cache_token(self, auth_token):
+        timeout = TOKEN_CACHE_TIMEOUT
+        if auth_token.expiry is not None:
+            remaining = (auth_token.expiry - timezone.now()).total_seconds()
+            timeout = min(timeout, int(remaining))
+        if timeout > 0:
+            cache.set(
+                get_token_cache_key(self.model, auth_token.digest),
+                (auth_token.user_id, auth_token.expiry),
+                timeout=timeout,
+            )
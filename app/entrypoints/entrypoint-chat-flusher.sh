@@ -0,0 +1,3 @@
+#!/bin/bash
+
+python3 manage.py flush_chat_messages
@@ -9,5 +9,12 @@ class TalkInline(admin.StackedInline):
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ["title", "organizer", "is_published", "started_at"]
+    list_display = [
+        "title",
+        "organizer",
+        "is_published",
+        "started_at",
+        "attendee_count",
+        "capacity",
+    ]
     inlines = [TalkInline]
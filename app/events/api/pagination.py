@@ -0,0 +1,51 @@
+from rest_framework import pagination
+
+
+class EventCursorPagination(pagination.CursorPagination):
+    ordering = ("-started_at", "-id")
+
+    def get_ordering(self, request, queryset, view):
+        only_upcoming = request.query_params.get("only_upcoming", "false")
+        if only_upcoming == "true":
+            return ("started_at", "id")
+        return self.ordering
+
+
+class EventListPagination(pagination.BasePagination):
+    """
+    Paginate with a cursor over (started_at, id), unless the client opts in
+    to the limit/offset pagination by passing a limit or an offset.
+    Search results are ordered by rank, so they always use limit/offset.
+    """
+
+    cursor_pagination_class = EventCursorPagination
+    limit_offset_pagination_class = pagination.LimitOffsetPagination
+
+    def get_paginator(self, request):
+        limit_offset = self.limit_offset_pagination_class
+        if (
+            "search" in request.query_params
+            or limit_offset.limit_query_param in request.query_params
+            or limit_offset.offset_query_param in request.query_params
+        ):
+            return limit_offset()
+        return self.cursor_pagination_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.cursor_pagination_class().get_paginated_response_schema(
+            schema
+        )
+
+    def get_schema_operation_parameters(self, view):
+        cursor_pagination = self.cursor_pagination_class()
+        limit_offset_pagination = self.limit_offset_pagination_class()
+        return cursor_pagination.get_schema_operation_parameters(
+            view
+        ) + limit_offset_pagination.get_schema_operation_parameters(view)
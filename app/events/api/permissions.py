@@ -9,24 +9,26 @@ class EventPermission(permissions.BasePermission):
             return request.user.is_authenticated
 
     def has_object_permission(self, request, view, event):
-        if view.action == "create_talk":
-            return event.organizer == request.user
+        if view.action in ["create_talk", "create_talks_bulk"]:
+            return event.organizer_id == request.user.pk
         elif view.action == "list_talks":
             if request.query_params.get("include_all") == "true":
-                return event.organizer == request.user
+                return event.organizer_id == request.user.pk
             else:
-                return event.is_published or event.organizer == request.user
+                return (
+                    event.is_published or event.organizer_id == request.user.pk
+                )
         elif view.action == "retrieve":
-            return event.is_published or event.organizer == request.user
+            return event.is_published or event.organizer_id == request.user.pk
         elif view.action in ["update", "partial_update"]:
-            return event.organizer == request.user and not (
+            return event.organizer_id == request.user.pk and not (
                 event.has_finished()
             )
         elif view.action == "create_booking":
-            return event.organizer != request.user and event.is_published
+            return event.organizer_id != request.user.pk and event.is_published
         elif view.action == "destroy_booking":
             return True
         elif view.action in ["destroy", "publish"]:
-            return event.organizer == request.user
+            return event.organizer_id == request.user.pk
         else:
             return False
@@ -1,6 +1,7 @@
 from django.utils import timezone
 from rest_framework import serializers, exceptions
 from rest_framework.exceptions import ValidationError
+from core.images import get_image_variant_urls
 from ..models import Event
 
 
@@ -9,6 +10,7 @@ class EventSerializer(serializers.ModelSerializer):
         slug_field="username",
         read_only=True,
     )
+    picture_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Event
@@ -18,10 +20,15 @@ class EventSerializer(serializers.ModelSerializer):
             "title",
             "description",
             "picture",
+            "picture_variants",
             "is_published",
             "started_at",
+            "capacity",
         ]
 
+    def get_picture_variants(self, event) -> dict:
+        return get_image_variant_urls(event.picture, event.picture_variants)
+
     def validate_started_at(self, started_at):
         if started_at < timezone.now():
             raise exceptions.ValidationError(
@@ -29,6 +36,17 @@ class EventSerializer(serializers.ModelSerializer):
             )
         return started_at
 
+    def validate_capacity(self, capacity):
+        if (
+            self.instance
+            and capacity is not None
+            and capacity < self.instance.attendee_count
+        ):
+            raise exceptions.ValidationError(
+                "capacity must not be less than the number of attendees."
+            )
+        return capacity
+
     def validate_is_published(self, value):
         if (
             self.instance
@@ -46,12 +64,8 @@ class EventSerializer(serializers.ModelSerializer):
 
 
 class ListRetrieveEventSerializer(EventSerializer):
-    is_booked = serializers.SerializerMethodField()
+    # Annotated by EventQuerySet.with_is_booked
+    is_booked = serializers.BooleanField(read_only=True)
 
     class Meta(EventSerializer.Meta):
-        fields = EventSerializer.Meta.fields + ["is_booked"]
-
-    def get_is_booked(self, event) -> bool:
-        return event.attendees.filter(
-            pk=self.context.get("user", None).pk
-        ).exists()
+        fields = EventSerializer.Meta.fields + ["attendee_count", "is_booked"]
@@ -1,5 +1,6 @@
+from django.db.models import Max
 from django.utils import timezone
-from rest_framework import pagination, viewsets, status
+from rest_framework import viewsets, status, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import (
@@ -8,12 +9,23 @@ from drf_spectacular.utils import (
     OpenApiParameter,
 )
 from drf_spectacular.types import OpenApiTypes
+from chats.authorization import revoke_connect_authorizations
+from core.conditional import conditional_response
 from talks.models import Talk
+from talks.api.pagination import TalkCursorPagination
 from talks.api.serializers import (
     TalkWithSpeakerDetailSerializer,
     TalkSerializer,
+    BulkTalkSerializer,
+)
+from ..cache import (
+    get_feed_page,
+    set_feed_page,
+    overlay_is_booked,
+    invalidate_booked_event_ids,
 )
 from ..models import Event
+from .pagination import EventListPagination
 from .permissions import EventPermission
 from .serializers import ListRetrieveEventSerializer, EventSerializer
 
@@ -34,7 +46,9 @@ from .serializers import ListRetrieveEventSerializer, EventSerializer
     destroy=extend_schema(responses={204: None, 401: None, 403: None}),
     list=extend_schema(
         description="Retrieve the published events, "
-        "ordered by decreasing order of started_at.",
+        "ordered by decreasing order of started_at. "
+        "The events are paginated with a cursor, unless a limit or an "
+        "offset is given.",
         parameters=[
             OpenApiParameter(
                 name="only_upcoming",
@@ -44,17 +58,28 @@ from .serializers import ListRetrieveEventSerializer, EventSerializer
                 description="Include only the upcoming events. "
                 "The events will be ordered in "
                 "increasing order of started_at.",
-            )
+            ),
+            OpenApiParameter(
+                name="search",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Search the title and description of the events. "
+                "The events will be ordered by relevance, "
+                "and paginated with a limit and an offset.",
+            ),
         ],
     ),
 )
 class EventViewSet(viewsets.ModelViewSet):
-    pagination_class = pagination.LimitOffsetPagination
+    pagination_class = EventListPagination
     permission_classes = [EventPermission]
 
     def get_queryset(self):
         if self.action == "list":
             queryset = Event.objects.is_published()
+            queryset = queryset.select_related("organizer").with_is_booked(
+                self.request.user
+            )
 
             only_upcoming = self.request.query_params.get(
                 "only_upcoming", "false"
@@ -64,7 +89,19 @@ class EventViewSet(viewsets.ModelViewSet):
                     started_at__gte=timezone.now()
                 ).order_by("started_at")
 
+            search = self.request.query_params.get("search")
+            if search:
+                queryset = queryset.search(search)
+
             return queryset
+        elif self.action == "retrieve":
+            return Event.objects.select_related("organizer").with_is_booked(
+                self.request.user
+            )
+        elif self.action == "list_talks":
+            return Event.objects.annotate(
+                speakers_updated_at=Max("talk__speaker__updated_at")
+            )
         else:
             return Event.objects.all()
 
@@ -74,12 +111,39 @@ class EventViewSet(viewsets.ModelViewSet):
         else:
             return EventSerializer
 
+    def list(self, request, *args, **kwargs):
+        page = get_feed_page(request)
+        if page is not None:
+            return Response(overlay_is_booked(page, request.user))
+
+        response = super().list(request, *args, **kwargs)
+        set_feed_page(request, response.data)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        event = self.get_object()
+        return conditional_response(
+            request,
+            event.updated_at,
+            [event.pk, request.user.pk],
+            lambda: Response(self.get_serializer(event).data),
+        )
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.pop("request")  # To return a relative picture URI
         context["user"] = self.request.user
         return context
 
+    def get_datetime_query_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        try:
+            return serializers.DateTimeField().run_validation(value)
+        except serializers.ValidationError as error:
+            raise serializers.ValidationError({name: error.detail})
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -88,26 +152,66 @@ class EventViewSet(viewsets.ModelViewSet):
                 location=OpenApiParameter.QUERY,
                 default=False,
                 description="Include pending and rejected talks.",
-            )
+            ),
+            OpenApiParameter(
+                name="from",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Only include the talks that end after this time.",
+            ),
+            OpenApiParameter(
+                name="to",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Only include the talks that start before this "
+                "time.",
+            ),
         ],
         responses={
             200: TalkWithSpeakerDetailSerializer(many=True),
+            400: None,
             401: None,
             403: None,
             404: None,
         },
     )
     @action(
-        detail=True, methods=["get"], url_path="talks", pagination_class=None
+        detail=True,
+        methods=["get"],
+        url_path="talks",
+        pagination_class=TalkCursorPagination,
     )
     def list_talks(self, request, pk):
         event = self.get_object()
-        queryset = Talk.objects.filter(event=event).only_approved()
         include_all = request.query_params.get("include_all", "false")
-        if include_all == "true":
-            queryset = Talk.objects.filter(event=event).all()
-        serializer = TalkWithSpeakerDetailSerializer(queryset, many=True)
-        return Response(serializer.data)
+        window_start = self.get_datetime_query_param("from")
+        window_end = self.get_datetime_query_param("to")
+
+        def get_response():
+            queryset = Talk.objects.filter(event=event).select_related(
+                "speaker"
+            )
+            if include_all != "true":
+                queryset = queryset.only_approved()
+            if window_start is not None:
+                queryset = queryset.filter(end__gt=window_start)
+            if window_end is not None:
+                queryset = queryset.filter(start__lt=window_end)
+
+            page = self.paginate_queryset(queryset)
+            serializer = TalkWithSpeakerDetailSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        # Talk changes bump the event, speaker changes bump the speakers.
+        last_modified = max(
+            event.updated_at, event.speakers_updated_at or event.updated_at
+        )
+        return conditional_response(
+            request,
+            last_modified,
+            [event.pk, request.build_absolute_uri()],
+            get_response,
+        )
 
     @extend_schema(
         request=TalkSerializer,
@@ -133,8 +237,41 @@ class EventViewSet(viewsets.ModelViewSet):
         )
 
     @extend_schema(
-        description="The event should be in the future and "
-        "the user should not be the organizer.",
+        description="Create the talks of a schedule at once. "
+        "The talks must not collide with each other "
+        "nor with the pending and approved talks of the event.",
+        request=BulkTalkSerializer(many=True),
+        responses={
+            201: TalkSerializer(many=True),
+            400: None,
+            401: None,
+            403: None,
+            404: None,
+        },
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="talks/bulk",
+        url_name="bulk-talks",
+        pagination_class=None,
+    )
+    def create_talks_bulk(self, request, pk):
+        event = self.get_object()
+        serializer = BulkTalkSerializer(
+            data=request.data,
+            many=True,
+            max_length=200,
+            context={"event": event},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description="The event should be in the future, "
+        "the user should not be the organizer, "
+        "and the event should not be fully booked.",
         request=None,
         responses={
             204: None,
@@ -161,13 +298,20 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
                 data={"detail": "Event has started."},
             )
-        if event.attendees.filter(pk=request.user.pk).exists():
+
+        booked, is_full = event.add_attendee(user)
+        if is_full:
+            return Response(
+                status=status.HTTP_409_CONFLICT,
+                data={"detail": "Event is fully booked."},
+            )
+        if not booked:
             return Response(
                 status=status.HTTP_409_CONFLICT,
                 data={"detail": "You have already booked this event."},
             )
 
-        event.attendees.add(user)
+        invalidate_booked_event_ids(user)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(
@@ -192,11 +336,16 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
                 data={"detail": "Event has started."},
             )
-        if not event.attendees.filter(pk=request.user.pk).exists():
+
+        if not event.remove_attendee(user):
             return Response(
                 status=status.HTTP_409_CONFLICT,
                 data={"detail": "You have not booked this event before."},
             )
 
-        event.attendees.remove(user)
+        invalidate_booked_event_ids(user)
+        # The raw SQL of remove_attendee doesn't send m2m_changed
+        revoke_connect_authorizations(
+            event.talk_set.values_list("pk", flat=True), [user.pk]
+        )
         return Response(status=status.HTTP_204_NO_CONTENT)
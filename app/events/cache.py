@@ -0,0 +1,82 @@
+import hashlib
+from uuid import uuid4
+from django.core.cache import cache
+from .models import Event
+
+FEED_VERSION_KEY = "events:feed:version"
+FEED_PAGE_TIMEOUT = 60
+BOOKED_EVENT_IDS_TIMEOUT = 60 * 60
+
+
+def get_feed_version():
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(FEED_VERSION_KEY, version, timeout=None):
+            version = cache.get(FEED_VERSION_KEY, version)
+    return version
+
+
+def invalidate_feed():
+    cache.set(FEED_VERSION_KEY, uuid4().hex, timeout=None)
+
+
+def get_feed_page_key(request):
+    query_params = sorted(request.query_params.lists())
+    digest = hashlib.sha256(
+        f"{request.get_host()}:{query_params}".encode("utf-8")
+    ).hexdigest()
+    return f"events:feed:{get_feed_version()}:{digest}"
+
+
+def get_feed_page(request):
+    return cache.get(get_feed_page_key(request))
+
+
+def set_feed_page(request, data):
+    """Cache a page of the feed, without the user-specific is_booked."""
+    page = dict(data)
+    page["results"] = [
+        {**event, "is_booked": False} for event in data["results"]
+    ]
+    cache.set(get_feed_page_key(request), page, timeout=FEED_PAGE_TIMEOUT)
+
+
+def get_booked_event_ids_key(user_id):
+    return f"events:booked:{user_id}"
+
+
+def get_booked_event_ids(user):
+    if not user.is_authenticated:
+        return frozenset()
+
+    key = get_booked_event_ids_key(user.pk)
+    booked_event_ids = cache.get(key)
+    if booked_event_ids is None:
+        booked_event_ids = frozenset(
+            Event.attendees.through.objects.filter(
+                user_id=user.pk
+            ).values_list("event_id", flat=True)
+        )
+        cache.set(key, booked_event_ids, timeout=BOOKED_EVENT_IDS_TIMEOUT)
+    return booked_event_ids
+
+
+def invalidate_booked_event_ids(user):
+    cache.delete(get_booked_event_ids_key(user.pk))
+
+
+def invalidate_booked_event_ids_of_users(user_ids):
+    cache.delete_many(
+        [get_booked_event_ids_key(user_id) for user_id in user_ids]
+    )
+
+
+def overlay_is_booked(page, user):
+    booked_event_ids = get_booked_event_ids(user)
+    page = dict(page)
+    page["results"] = [
+        {**event, "is_booked": event["id"] in booked_event_ids}
+        for event in page["results"]
+    ]
+    return page
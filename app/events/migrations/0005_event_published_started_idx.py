@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0004_alter_event_attendees"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["is_published", "started_at", "id"],
+                name="event_published_started_idx",
+            ),
+        ),
+    ]
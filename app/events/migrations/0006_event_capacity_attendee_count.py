@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:41
+
+from django.db import migrations, models
+
+
+def count_attendees(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    attendee_count = (
+        Event.attendees.through.objects.filter(
+            event_id=models.OuterRef("pk")
+        )
+        .values("event_id")
+        .annotate(count=models.Count("*"))
+        .values("count")
+    )
+    Event.objects.filter(attendees__isnull=False).update(
+        attendee_count=models.Subquery(attendee_count)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_event_published_started_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="attendee_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="capacity",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(count_attendees, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="event",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    ("capacity__isnull", True),
+                    ("attendee_count__lte", models.F("capacity")),
+                    _connector="OR",
+                ),
+                name="event_attendee_count_lte_capacity",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:49
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def update_search_vector(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    Event.objects.update(
+        search_vector=django.contrib.postgres.search.SearchVector(
+            "title", weight="A", config="english"
+        )
+        + django.contrib.postgres.search.SearchVector(
+            "description", weight="B", config="english"
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_event_capacity_attendee_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="event_search_vector_idx"
+            ),
+        ),
+        migrations.RunPython(update_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0009_event_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["organizer", "started_at"],
+                name="event_organizer_started_idx",
+            ),
+        ),
+        # The attendees through table is auto-created, so its index can't be
+        # declared on a model.
+        migrations.RunSQL(
+            "CREATE INDEX event_attendees_user_event_idx "
+            "ON events_event_attendees (user_id, event_id)",
+            "DROP INDEX event_attendees_user_event_idx",
+        ),
+    ]
@@ -1,4 +1,13 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Now
 from django.utils import timezone
 from users.models import User
 
@@ -7,10 +16,87 @@ class EventQuerySet(models.QuerySet):
     def is_published(self):
         return self.filter(is_published=True)
 
+    def has_available_seats(self):
+        return self.filter(
+            Q(capacity__isnull=True) | Q(attendee_count__lt=F("capacity"))
+        )
+
+    def update_attendee_count(self):
+        attendee_count = (
+            Event.attendees.through.objects.filter(event_id=OuterRef("pk"))
+            .values("event_id")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return self.update(
+            attendee_count=Coalesce(Subquery(attendee_count), Value(0)),
+            updated_at=Now(),
+        )
+
+    def search(self, text):
+        query = SearchQuery(text, config="english", search_type="websearch")
+        return (
+            self.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-started_at", "-id")
+        )
+
+    def update_search_vector(self):
+        return self.update(
+            search_vector=SearchVector("title", weight="A", config="english")
+            + SearchVector("description", weight="B", config="english")
+        )
+
+    def with_status(self, status):
+        """
+        Filter the events by status: upcoming and past events are published,
+        drafts are not.
+        """
+        now = timezone.now()
+        if status == "upcoming":
+            return self.filter(is_published=True, started_at__gte=now)
+        elif status == "past":
+            return self.filter(is_published=True, started_at__lt=now)
+        elif status == "draft":
+            return self.filter(is_published=False)
+        raise ValueError(f"Unknown event status: {status}")
+
+    def touch(self):
+        return self.update(updated_at=Now())
+
+    def with_is_booked(self, user):
+        if not user.is_authenticated:
+            return self.annotate(is_booked=Value(False))
+        return self.annotate(
+            is_booked=Exists(
+                Event.attendees.through.objects.filter(
+                    event_id=OuterRef("pk"), user_id=user.pk
+                )
+            )
+        )
+
 
 class Event(models.Model):
     class Meta:
         ordering = ("-started_at",)
+        indexes = [
+            models.Index(
+                fields=["is_published", "started_at", "id"],
+                name="event_published_started_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="event_search_vector_idx"),
+            models.Index(
+                fields=["organizer", "started_at"],
+                name="event_organizer_started_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=Q(capacity__isnull=True)
+                | Q(attendee_count__lte=F("capacity")),
+                name="event_attendee_count_lte_capacity",
+            ),
+        ]
 
     organizer = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="organized_events"
@@ -21,16 +107,111 @@ class Event(models.Model):
     title = models.CharField(max_length=60)
     description = models.TextField(blank=True)
     picture = models.ImageField(blank=True, upload_to="events/pictures")
+    # Maps each of core.images.IMAGE_VARIANTS to its storage name
+    picture_variants = models.JSONField(default=dict, editable=False)
     is_published = models.BooleanField(default=False)
     started_at = models.DateTimeField()
+    # Also bumped by bookings and by changes to the talks of the event
+    updated_at = models.DateTimeField(auto_now=True)
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+    # Maintained by add_attendee, remove_attendee and the attendees
+    # m2m_changed signal
+    attendee_count = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by the post_save signal
+    search_vector = SearchVectorField(null=True, editable=False)
     objects = EventQuerySet.as_manager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_published = instance.__dict__.get("is_published")
+        instance._loaded_search_text = instance.get_search_text()
+        return instance
+
     def __str__(self):
         return self.title
 
+    def was_published(self):
+        """Whether the event was published when it was loaded."""
+        return getattr(self, "_loaded_is_published", None) is True
+
+    def get_search_text(self):
+        return self.__dict__.get("title"), self.__dict__.get("description")
+
+    def has_search_text_changed(self):
+        """Whether the title or the description changed since loading."""
+        return (
+            getattr(self, "_loaded_search_text", None)
+            != self.get_search_text()
+        )
+
     def has_finished(self):
         # To do
         return False
 
     def has_started(self):
         return self.started_at <= timezone.now()
+
+    def add_attendee(self, user):
+        """
+        Book the event for the user in a single statement, which inserts the
+        booking unless it exists and takes a seat if one is available.
+        Returns a (booked, is_full) pair.
+        """
+        events_table = Event._meta.db_table
+        attendees_table = Event.attendees.through._meta.db_table
+        sql = f"""
+            WITH seat AS (
+                SELECT id FROM {events_table}
+                WHERE id = %(event_id)s
+                AND (capacity IS NULL OR attendee_count < capacity)
+            ), booking AS (
+                INSERT INTO {attendees_table} (event_id, user_id)
+                SELECT id, %(user_id)s FROM seat
+                ON CONFLICT DO NOTHING
+                RETURNING event_id
+            ), updated AS (
+                UPDATE {events_table}
+                SET attendee_count = attendee_count + 1, updated_at = now()
+                WHERE id IN (SELECT event_id FROM booking)
+                RETURNING id
+            )
+            SELECT
+                EXISTS (SELECT FROM updated),
+                EXISTS (SELECT FROM seat),
+                EXISTS (
+                    SELECT FROM {attendees_table}
+                    WHERE event_id = %(event_id)s AND user_id = %(user_id)s
+                )
+        """
+        params = {"event_id": self.pk, "user_id": user.pk}
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                booked, has_seat, was_booked = cursor.fetchone()
+        except IntegrityError:
+            # A concurrent booking took the last seat first, so the counter
+            # update violated the capacity constraint.
+            return False, True
+        return booked, not has_seat and not was_booked
+
+    def remove_attendee(self, user):
+        """
+        Cancel the booking of the user and release its seat in a single
+        statement. Returns whether the user had booked the event.
+        """
+        events_table = Event._meta.db_table
+        attendees_table = Event.attendees.through._meta.db_table
+        sql = f"""
+            WITH booking AS (
+                DELETE FROM {attendees_table}
+                WHERE event_id = %(event_id)s AND user_id = %(user_id)s
+                RETURNING event_id
+            )
+            UPDATE {events_table}
+            SET attendee_count = attendee_count - 1, updated_at = now()
+            WHERE id IN (SELECT event_id FROM booking)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {"event_id": self.pk, "user_id": user.pk})
+            return cursor.rowcount == 1
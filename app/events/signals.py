@@ -0,0 +1,78 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+from core.images import reset_image_variants, schedule_image_variants
+from .cache import invalidate_booked_event_ids_of_users, invalidate_feed
+from .models import Event
+
+
+@receiver(post_save, sender=Event)
+def post_save_event_invalidate_feed(sender, instance, created, **kwargs):
+    if instance.is_published or instance.was_published():
+        invalidate_feed()
+
+
+@receiver(post_save, sender=Event)
+def post_save_event_update_search_vector(
+    sender, instance, update_fields, **kwargs
+):
+    if update_fields is not None and not {"title", "description"} & set(
+        update_fields
+    ):
+        return
+    if instance.has_search_text_changed():
+        Event.objects.filter(pk=instance.pk).update_search_vector()
+        instance._loaded_search_text = instance.get_search_text()
+
+
+@receiver(pre_save, sender=Event)
+def pre_save_event_reset_picture_variants(sender, instance, **kwargs):
+    reset_image_variants(instance, "picture")
+
+
+@receiver(post_save, sender=Event)
+def post_save_event_schedule_picture_variants(sender, instance, **kwargs):
+    schedule_image_variants(instance, "picture")
+
+
+@receiver(post_delete, sender=Event)
+def post_delete_event_invalidate_feed(sender, instance, **kwargs):
+    if instance.is_published or instance.was_published():
+        invalidate_feed()
+
+
+# The booking endpoints maintain attendee_count themselves. This keeps it
+# right when the attendees are changed through the m2m manager instead.
+@receiver(m2m_changed, sender=Event.attendees.through)
+def m2m_changed_event_attendees_update_attendee_count(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if reverse and action == "pre_clear":
+        instance._cleared_booked_event_ids = list(
+            instance.booked_events.values_list("pk", flat=True)
+        )
+    elif action == "pre_clear":
+        instance._cleared_attendee_ids = list(
+            instance.attendees.values_list("pk", flat=True)
+        )
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+
+    if not reverse:
+        event_ids = [instance.pk]
+        if action == "post_clear":
+            user_ids = instance._cleared_attendee_ids
+        else:
+            user_ids = pk_set
+    else:
+        if action == "post_clear":
+            event_ids = instance._cleared_booked_event_ids
+        else:
+            event_ids = pk_set
+        user_ids = [instance.pk]
+    Event.objects.filter(pk__in=event_ids).update_attendee_count()
+    invalidate_booked_event_ids_of_users(user_ids)
@@ -0,0 +1,10 @@
+from rest_framework import pagination
+
+
+class TalkCursorPagination(pagination.CursorPagination):
+    ordering = ("start", "id")
+
+
+class MessageCursorPagination(pagination.CursorPagination):
+    ordering = "-id"
+    page_size = 50
@@ -8,6 +8,18 @@ class TalkPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, talk):
         if view.action == "retrieve_stream_key":
             return request.user == talk.speaker and talk.event.is_published
+        elif view.action == "list_messages":
+            return talk.event.is_published and (
+                request.user.pk in [talk.speaker_id, talk.event.organizer_id]
+                or talk.event.attendees.filter(pk=request.user.pk).exists()
+            )
+        elif view.action == "update_slow_mode":
+            return request.user.pk == talk.event.organizer_id
+        elif view.action == "retrieve_viewers":
+            return request.user.pk in [
+                talk.speaker_id,
+                talk.event.organizer_id,
+            ]
         elif talk.has_started():
             return False
         elif view.action in [
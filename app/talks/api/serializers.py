@@ -1,11 +1,36 @@
+from contextlib import contextmanager
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from rest_framework import serializers, exceptions
+from rest_framework.settings import api_settings
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
 from users.models import User
 from events.models import Event
+from ..mails import send_talk_invitation_mails
 from ..models import Talk
 
 
+@contextmanager
+def talk_collision_errors():
+    """
+    Turn violations of the talk_exclude_overlapping constraint into the
+    validation error of a collision.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as error:
+        if "talk_exclude_overlapping" not in str(error):
+            raise
+        raise exceptions.ValidationError(
+            {
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "Talk collides with other talks."
+                ]
+            }
+        )
+
+
 class TalkSerializer(serializers.ModelSerializer):
     speaker = serializers.SlugRelatedField(
         queryset=User.verified_objects.all(),
@@ -40,19 +65,83 @@ class TalkSerializer(serializers.ModelSerializer):
                 "start field must be at least the started_at field of the "
                 "event."
             )
-        if Talk.objects.filter(
+        return attrs
+
+    def create(self, validated_data):
+        with talk_collision_errors():
+            return Talk.objects.create(
+                event=self.context.get("event"), **validated_data
+            )
+
+
+class BulkTalkListSerializer(serializers.ListSerializer):
+    def validate_speakers(self, attrs):
+        """Replace the speaker usernames with the users, with one query."""
+        usernames = {talk["speaker"] for talk in attrs}
+        speakers = {
+            user.username: user
+            for user in User.verified_objects.filter(username__in=usernames)
+        }
+        for index, talk in enumerate(attrs):
+            if talk["speaker"] not in speakers:
+                raise exceptions.ValidationError(
+                    f"Talk {index} speaker does not exist."
+                )
+            talk["speaker"] = speakers[talk["speaker"]]
+
+    def validate(self, attrs):
+        if not attrs:
+            raise exceptions.ValidationError("At least one talk is required.")
+        self.validate_speakers(attrs)
+
+        event = self.context.get("event")
+        start = min(talk["start"] for talk in attrs)
+        end = max(talk["end"] for talk in attrs)
+        existing_talks = Talk.objects.filter(
             status__in=["pending", "approved"],
-            event=self.context.get("event"),
-            start__lt=attrs["end"],
-            end__gt=attrs["start"],
-        ):
-            raise exceptions.ValidationError("Talk collides with other talks.")
+            event=event,
+            start__lt=end,
+            end__gt=start,
+        ).values_list("start", "end")
+
+        # Sweep the talks in the order of their start, remembering the one
+        # that ends last. A talk that starts before that end collides with
+        # it, which matters when one of the two talks is in the batch.
+        talks = [(start, end, None) for start, end in existing_talks]
+        talks += [
+            (talk["start"], talk["end"], index)
+            for index, talk in enumerate(attrs)
+        ]
+        talks.sort(key=lambda talk: talk[0])
+        last_end, last_index = None, None
+        for start, end, index in talks:
+            if last_end is not None and start < last_end:
+                if index is not None or last_index is not None:
+                    index = last_index if index is None else index
+                    raise exceptions.ValidationError(
+                        f"Talk {index} collides with other talks."
+                    )
+            if last_end is None or end > last_end:
+                last_end, last_index = end, index
         return attrs
 
     def create(self, validated_data):
-        return Talk.objects.create(
-            event=self.context.get("event"), **validated_data
-        )
+        event = self.context.get("event")
+        with talk_collision_errors():
+            talks = Talk.objects.bulk_create(
+                [Talk(event=event, **attrs) for attrs in validated_data]
+            )
+        Event.objects.filter(pk=event.pk).touch()
+        send_talk_invitation_mails(talks)
+        return talks
+
+
+class BulkTalkSerializer(TalkSerializer):
+    # Resolved by BulkTalkListSerializer for all the talks at once
+    speaker = serializers.CharField(write_only=True)
+
+    class Meta(TalkSerializer.Meta):
+        list_serializer_class = BulkTalkListSerializer
 
 
 class TalkSpeakerSerializer(serializers.ModelSerializer):
@@ -92,6 +181,21 @@ class TalkWithEventDetailSerializer(TalkSerializer):
     event = TalkEventSerializer()
 
 
+class MessageSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    stream_id = serializers.CharField()
+    username = serializers.CharField(source="user.username")
+    message = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
+class SlowModeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Talk
+        fields = ["slow_mode"]
+        extra_kwargs = {"slow_mode": {"max_value": 60 * 60}}
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
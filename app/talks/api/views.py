@@ -1,3 +1,4 @@
+from django.utils import timezone
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -5,9 +6,17 @@ from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
 )
+from chats.models import Message
+from ..live import invalidate_live_talks
 from ..models import Talk
+from ..viewers import get_viewers
+from .pagination import MessageCursorPagination
 from .permissions import TalkPermission
-from .serializers import UpdateTalkSerializer
+from .serializers import (
+    MessageSerializer,
+    SlowModeSerializer,
+    UpdateTalkSerializer,
+)
 
 
 @extend_schema_view(
@@ -23,6 +32,36 @@ from .serializers import UpdateTalkSerializer
     retrieve_stream_key=extend_schema(
         request=None, responses={200: None, 401: None, 403: None, 404: None}
     ),
+    retrieve_viewers=extend_schema(
+        description="Returns the number of current viewers of the talk,"
+        " and an estimate of its unique viewers."
+        " Only the speaker and the organizer can retrieve them.",
+        request=None,
+        responses={200: None, 401: None, 403: None, 404: None},
+    ),
+    list_messages=extend_schema(
+        description="Returns the chat messages of the talk, newest first."
+        " Only the attendees, the speaker and the organizer can list"
+        " them. Messages are stored shortly after they are sent."
+        " The stream_id of the newest message can be passed as since"
+        " when connecting to the chat, to receive the messages sent"
+        " after it.",
+        request=None,
+        responses={200: MessageSerializer(many=True), 401: None, 403: None},
+    ),
+    update_slow_mode=extend_schema(
+        description="Sets the seconds a user waits between chat messages"
+        " in the talk, 0 turns slow mode off."
+        " Only the organizer can update it, also while the talk is live.",
+        request=SlowModeSerializer,
+        responses={
+            200: SlowModeSerializer,
+            400: None,
+            401: None,
+            403: None,
+            404: None,
+        },
+    ),
 )
 class TalkViewSet(
     mixins.UpdateModelMixin,
@@ -33,9 +72,55 @@ class TalkViewSet(
     permission_classes = [TalkPermission]
     serializer_class = UpdateTalkSerializer
 
+    def get_queryset(self):
+        if self.action in [
+            "retrieve_viewers",
+            "list_messages",
+            "update_slow_mode",
+        ]:
+            return self.queryset.select_related("event")
+        return self.queryset
+
     @action(detail=True, methods=["get"], url_path="key")
     def retrieve_stream_key(self, request, pk):
         talk = self.get_object()
         return Response(
             status=status.HTTP_200_OK, data={"stream_key": talk.stream_key}
         )
+
+    @action(detail=True, methods=["get"], url_path="viewers")
+    def retrieve_viewers(self, request, pk):
+        talk = self.get_object()
+        viewers, unique_viewers = get_viewers([talk.pk])[talk.pk]
+        return Response(
+            status=status.HTTP_200_OK,
+            data={"viewers": viewers, "unique_viewers": unique_viewers},
+        )
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="messages",
+        pagination_class=MessageCursorPagination,
+    )
+    def list_messages(self, request, pk):
+        talk = self.get_object()
+        queryset = Message.objects.filter(talk=talk).select_related("user")
+        page = self.paginate_queryset(queryset)
+        serializer = MessageSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["put"], url_path="slow-mode")
+    def update_slow_mode(self, request, pk):
+        talk = self.get_object()
+        serializer = SlowModeSerializer(talk, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        slow_mode = serializer.validated_data["slow_mode"]
+        # Saving the talk would send the organizer a status mail
+        Talk.objects.filter(pk=talk.pk).update(
+            slow_mode=slow_mode, updated_at=timezone.now()
+        )
+        invalidate_live_talks()
+        return Response(
+            status=status.HTTP_200_OK, data={"slow_mode": slow_mode}
+        )
@@ -0,0 +1,141 @@
+import time
+from typing import NamedTuple
+from uuid import uuid4
+from datetime import datetime
+from channels.db import database_sync_to_async
+from django.utils import timezone
+from core.redis import get_async_redis, get_redis
+from .models import Talk
+
+LIVE_TALKS_VERSION_KEY = "talks:live:version"
+LIVE_TALKS_TIMEOUT = 30
+PLAY_AUTHORIZATION_TIMEOUT = 60
+
+
+class LiveTalk(NamedTuple):
+    """An approved talk of a published event, as the streaming hooks see it."""
+
+    id: int
+    event_id: int
+    start: datetime
+    end: datetime
+    stream_key: str
+    slow_mode: int
+
+    def has_started(self):
+        return self.start <= timezone.now()
+
+    def has_finished(self):
+        return self.end < timezone.now()
+
+
+class LiveTalkIndex:
+    """
+    A per-process index of the approved talks of published events that are
+    live, or start within LIVE_TALKS_TIMEOUT. It is reloaded when it gets
+    older than that, or when a talk or an event changes in any process.
+    """
+
+    def __init__(self):
+        self.talks = {}
+        self.version = None
+        self.loaded_at = None
+
+    def is_stale(self, version):
+        return (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > LIVE_TALKS_TIMEOUT
+            or version != self.version
+        )
+
+    def get_queryset(self):
+        now = timezone.now()
+        return Talk.objects.filter(
+            status="approved",
+            event__is_published=True,
+            start__lte=now + timezone.timedelta(seconds=LIVE_TALKS_TIMEOUT),
+            end__gte=now,
+        ).values_list(
+            "id", "event_id", "start", "end", "stream_key", "slow_mode"
+        )
+
+    def set_talks(self, talks, version, loaded_at):
+        self.talks = {talk[0]: LiveTalk(*talk) for talk in talks}
+        self.version = version
+        self.loaded_at = loaded_at
+
+    def load(self, version):
+        loaded_at = time.monotonic()
+        self.set_talks(list(self.get_queryset()), version, loaded_at)
+
+    def get(self, talk_id):
+        version = get_redis().get(LIVE_TALKS_VERSION_KEY)
+        if self.is_stale(version):
+            self.load(version)
+        return self.talks.get(talk_id)
+
+    async def aget(self, talk_id, consumer=False):
+        """
+        Like get, from async code. The index of the consumers is reloaded
+        through database_sync_to_async, which closes the broken and expired
+        connections around the query, as Django does around the requests of
+        the async views.
+        """
+        version = await get_async_redis().get(LIVE_TALKS_VERSION_KEY)
+        if self.is_stale(version):
+            if consumer:
+                await database_sync_to_async(self.load)(version)
+            else:
+                loaded_at = time.monotonic()
+                talks = [talk async for talk in self.get_queryset()]
+                self.set_talks(talks, version, loaded_at)
+        return self.talks.get(talk_id)
+
+
+live_talks = LiveTalkIndex()
+
+
+def invalidate_live_talks():
+    get_redis().set(LIVE_TALKS_VERSION_KEY, uuid4().hex)
+
+
+def get_play_authorization_key(talk_id, user_id):
+    return f"talks:play:{talk_id}:{user_id}"
+
+
+def is_play_authorized(talk_id, user_id, is_authorized):
+    """
+    Remember for a while that the user may play the talk, so that the
+    is_authorized query only runs on the first play of the user.
+    """
+    key = get_play_authorization_key(talk_id, user_id)
+    if get_redis().exists(key):
+        return True
+    if not is_authorized():
+        return False
+    get_redis().set(key, 1, ex=PLAY_AUTHORIZATION_TIMEOUT)
+    return True
+
+
+async def ais_play_authorized(talk_id, user_id, is_authorized):
+    """The async version of is_play_authorized, is_authorized is async."""
+    key = get_play_authorization_key(talk_id, user_id)
+    if await get_async_redis().exists(key):
+        return True
+    if not await is_authorized():
+        return False
+    await get_async_redis().set(key, 1, ex=PLAY_AUTHORIZATION_TIMEOUT)
+    return True
+
+
+def revoke_play_authorizations(event_ids, user_ids):
+    talk_ids = Talk.objects.filter(event_id__in=event_ids).values_list(
+        "id", flat=True
+    )
+    keys = [
+        get_play_authorization_key(talk_id, user_id)
+        for talk_id in talk_ids
+        for user_id in user_ids
+    ]
+    if keys:
+        get_redis().delete(*keys)
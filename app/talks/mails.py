@@ -1,8 +1,8 @@
 from django.template.loader import render_to_string
-from core.tasks import send_mail_task
+from core.mails import queue_mail, queue_mails
 
 
-def send_talk_invitation_mail(talk):
+def get_talk_invitation_mail(talk):
     subject = "Online Events | Talk Invitation"
     message = render_to_string(
         "talks/invitation_mail.html",
@@ -12,8 +12,15 @@ def send_talk_invitation_mail(talk):
             "event_title": talk.event.title,
         },
     )
+    return subject, message, [talk.speaker.email]
+
+
+def send_talk_invitation_mail(talk):
+    queue_mail(*get_talk_invitation_mail(talk))
+
 
-    send_mail_task.delay(subject, message, [talk.speaker.email])
+def send_talk_invitation_mails(talks):
+    queue_mails([get_talk_invitation_mail(talk) for talk in talks])
 
 
 def send_talk_status_mail(talk):
@@ -29,4 +36,4 @@ def send_talk_status_mail(talk):
         },
     )
 
-    send_mail_task.delay(subject, message, [talk.event.organizer.email])
+    queue_mail(subject, message, [talk.event.organizer.email])
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("talks", "0002_talk_stream_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="talk",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
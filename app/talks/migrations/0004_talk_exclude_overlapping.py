@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:09
+
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+import talks.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("talks", "0003_talk_updated_at"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name="talk",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(("status__in", ["pending", "approved"])),
+                expressions=[
+                    ("event", "="),
+                    (talks.models.TsTzRange("start", "end"), "&&"),
+                ],
+                name="talk_exclude_overlapping",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("talks", "0004_talk_exclude_overlapping"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="talk",
+            index=models.Index(
+                fields=["event", "status", "start"],
+                name="talk_event_status_start_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("talks", "0005_talk_event_status_start_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TalkViewers",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("viewers", models.PositiveIntegerField()),
+                ("unique_viewers", models.PositiveIntegerField()),
+                (
+                    "created_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "talk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="viewer_samples",
+                        to="talks.talk",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["talk", "created_at"],
+                        name="talkviewers_talk_created_idx",
+                    )
+                ],
+            },
+        ),
+    ]
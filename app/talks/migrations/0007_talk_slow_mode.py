@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("talks", "0006_talkviewers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="talk",
+            name="slow_mode",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
 from django.utils import timezone
 from django.db import models
 from events.models import Event
@@ -6,6 +8,11 @@ from django.utils.crypto import get_random_string
 from functools import partial
 
 
+class TsTzRange(models.Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
 class TalkQuerySet(models.QuerySet):
     def only_approved(self):
         return self.filter(status="approved")
@@ -25,16 +32,56 @@ class Talk(models.Model):
     status = models.CharField(
         choices=STATUSES, max_length=8, default="pending"
     )
+    updated_at = models.DateTimeField(auto_now=True)
     stream_key = models.CharField(
         max_length=20,
         unique=True,
         default=partial(get_random_string, 20),
     )
+    # The seconds a user waits between chat messages, 0 turns slow mode off
+    slow_mode = models.PositiveIntegerField(default=0)
 
     objects = TalkQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["event", "status", "start"],
+                name="talk_event_status_start_idx",
+            ),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name="talk_exclude_overlapping",
+                expressions=[
+                    ("event", RangeOperators.EQUAL),
+                    (TsTzRange("start", "end"), RangeOperators.OVERLAPS),
+                ],
+                condition=models.Q(status__in=["pending", "approved"]),
+            ),
+        ]
+
     def has_started(self):
         return self.start <= timezone.now()
 
     def has_finished(self):
         return self.end < timezone.now()
+
+
+class TalkViewers(models.Model):
+    """A sample of the viewers of a talk, rolled up from Redis."""
+
+    talk = models.ForeignKey(
+        Talk, on_delete=models.CASCADE, related_name="viewer_samples"
+    )
+    viewers = models.PositiveIntegerField()
+    unique_viewers = models.PositiveIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["talk", "created_at"],
+                name="talkviewers_talk_created_idx",
+            ),
+        ]
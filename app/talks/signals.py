@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
+from .live import invalidate_live_talks, revoke_play_authorizations
 from .mails import send_talk_invitation_mail, send_talk_status_mail
+from events.models import Event
 from .models import Talk
 
 
@@ -16,3 +18,41 @@ def post_save_talk_send_talk_invitation_mail(
 def post_save_talk_send_talk_status_mail(sender, instance, created, **kwargs):
     if created is False:
         send_talk_status_mail(instance)
+
+
+@receiver(post_save, sender=Talk)
+@receiver(post_delete, sender=Talk)
+def post_save_delete_talk_touch_event(sender, instance, **kwargs):
+    Event.objects.filter(pk=instance.event_id).touch()
+
+
+@receiver(post_save, sender=Talk)
+@receiver(post_delete, sender=Talk)
+def post_save_delete_talk_invalidate_live_talks(sender, instance, **kwargs):
+    invalidate_live_talks()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def post_save_delete_event_invalidate_live_talks(sender, instance, **kwargs):
+    if instance.is_published or instance.was_published():
+        invalidate_live_talks()
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def m2m_changed_event_attendees_revoke_play_authorizations(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear":
+        # The cleared attendees or events are not known afterwards
+        if reverse:
+            pk_set = set(instance.booked_events.values_list("pk", flat=True))
+        else:
+            pk_set = set(instance.attendees.values_list("pk", flat=True))
+    elif action != "post_remove":
+        return
+
+    if reverse:
+        revoke_play_authorizations(pk_set, [instance.pk])
+    else:
+        revoke_play_authorizations([instance.pk], pk_set)
@@ -0,0 +1,39 @@
+import logging
+from celery import shared_task
+from django.utils import timezone
+from .models import Talk, TalkViewers
+from .viewers import deactivate_talks, get_active_talk_ids, get_viewers
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="talks__rollup_viewers")
+def rollup_viewers():
+    """
+    Store a sample of the viewers of each talk that has been played, with
+    one bulk insert. Talks that have no viewers left stop being sampled.
+    """
+    viewers = get_viewers(get_active_talk_ids())
+    existing_talk_ids = set(
+        Talk.objects.filter(pk__in=viewers).values_list("pk", flat=True)
+    )
+    now = timezone.now()
+    samples = TalkViewers.objects.bulk_create(
+        TalkViewers(
+            talk_id=talk_id,
+            viewers=count,
+            unique_viewers=unique_count,
+            created_at=now,
+        )
+        for talk_id, (count, unique_count) in viewers.items()
+        if talk_id in existing_talk_ids
+    )
+    deactivate_talks(
+        [
+            talk_id
+            for talk_id, (count, _unique_count) in viewers.items()
+            if count == 0 or talk_id not in existing_talk_ids
+        ]
+    )
+    logger.info("Rolled up the viewers of %d talks", len(samples))
+    return {"talks": len(samples)}
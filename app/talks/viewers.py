@@ -0,0 +1,81 @@
+from core.redis import get_async_redis, get_redis
+
+ACTIVE_TALKS_KEY = "talks:viewers:active"
+VIEWERS_TIMEOUT = 24 * 60 * 60
+
+
+def get_sessions_key(talk_id):
+    return f"talks:viewers:{talk_id}:sessions"
+
+
+def get_unique_viewers_key(talk_id):
+    return f"talks:viewers:{talk_id}:unique"
+
+
+def add_viewer_commands(pipeline, talk_id, user_id, client_id):
+    """
+    Queue the commands that record a play session: the SRS client id in a
+    set of the sessions of the talk, and the user in a HyperLogLog of its
+    unique viewers. The keys expire in case SRS misses an on_stop.
+    """
+    sessions_key = get_sessions_key(talk_id)
+    unique_viewers_key = get_unique_viewers_key(talk_id)
+    pipeline.sadd(sessions_key, client_id)
+    pipeline.expire(sessions_key, VIEWERS_TIMEOUT)
+    pipeline.pfadd(unique_viewers_key, user_id)
+    pipeline.expire(unique_viewers_key, VIEWERS_TIMEOUT)
+    pipeline.sadd(ACTIVE_TALKS_KEY, talk_id)
+    return pipeline
+
+
+def add_viewer(talk_id, user_id, client_id):
+    add_viewer_commands(
+        get_redis().pipeline(), talk_id, user_id, client_id
+    ).execute()
+
+
+async def aadd_viewer(talk_id, user_id, client_id):
+    await add_viewer_commands(
+        get_async_redis().pipeline(), talk_id, user_id, client_id
+    ).execute()
+
+
+def remove_viewer(talk_id, client_id):
+    get_redis().srem(get_sessions_key(talk_id), client_id)
+
+
+async def aremove_viewer(talk_id, client_id):
+    await get_async_redis().srem(get_sessions_key(talk_id), client_id)
+
+
+def clear_viewers(talk_id):
+    """The stream is unpublished, so all of its play sessions stop."""
+    get_redis().delete(get_sessions_key(talk_id))
+
+
+async def aclear_viewers(talk_id):
+    await get_async_redis().delete(get_sessions_key(talk_id))
+
+
+def get_viewers(talk_ids):
+    """Return the (viewers, unique viewers) of each of the talks."""
+    pipeline = get_redis().pipeline()
+    for talk_id in talk_ids:
+        pipeline.scard(get_sessions_key(talk_id))
+        pipeline.pfcount(get_unique_viewers_key(talk_id))
+    counts = pipeline.execute()
+    return {
+        talk_id: (counts[2 * i], counts[2 * i + 1])
+        for i, talk_id in enumerate(talk_ids)
+    }
+
+
+def get_active_talk_ids():
+    return sorted(
+        int(talk_id) for talk_id in get_redis().smembers(ACTIVE_TALKS_KEY)
+    )
+
+
+def deactivate_talks(talk_ids):
+    if talk_ids:
+        get_redis().srem(ACTIVE_TALKS_KEY, *talk_ids)
@@ -1,7 +1,8 @@
 import pytest
 from django.urls import reverse
 from django.utils import timezone
-from users.models import PlayStreamKey, VerificationKey
+from users.keys import create_key
+from users.models import VerificationKey
 from tests.events.factories import EventFactory
 from tests.talks.factories import TalkFactory
 from tests.users.factories import UserFactory
@@ -41,9 +42,10 @@ def payload_for_streaming():
 
 @pytest.fixture
 def play_stream_key():
-    def play_stream_key(for_user=None):
+    def play_stream_key(for_user=None, talk_id=None, minutes=10):
         user = UserFactory.create() if for_user is None else for_user
-        _, token = PlayStreamKey.objects.create(user)
+        expiry = timezone.timedelta(minutes=minutes)
+        token, _ = create_key(user, "play_stream", expiry, talk_id)
         return token
 
     return play_stream_key
@@ -82,3 +84,13 @@ def send_verify_email_request(send_request):
         return send_request(url, "post", payload)
 
     return send_verify_email_request
+
+
+@pytest.fixture(params=["sync", "async"])
+def stream_hook_url(request):
+    def stream_hook_url(hook):
+        if request.param == "async":
+            return reverse(f"stream-async-{hook}")
+        return reverse(f"stream-{hook}")
+
+    return stream_hook_url
@@ -4,6 +4,7 @@ from django.urls import reverse
 from tests.users.conftest import get_user_representation
 from django.contrib.auth import authenticate
 from tests.users.factories import UserFactory
+from talks.viewers import add_viewer, get_viewers
 
 pytestmark = pytest.mark.django_db
 __all__ = ["get_user_representation"]
@@ -52,6 +53,77 @@ class TestAuthEndpoints:
         )
         assert response.status_code == 204
 
+    def test_token_authentication_is_cached_until_logout(
+        self, send_request, assert_num_queries
+    ):
+        user = UserFactory.create()
+        url = reverse("knox-login")
+        payload = {"username": user.username, "password": "password"}
+        token = send_request(url, "post", payload).data["token"]
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+        url = reverse(
+            "user-retrieve-chat-key", kwargs={"username": user.username}
+        )
+        response = send_request(url, "get", **headers)
+        assert response.status_code == 200
+
+        # The authenticated user and the requested user
+        with assert_num_queries(2):
+            response = send_request(url, "get", **headers)
+        assert response.status_code == 200
+
+        response = send_request(reverse("knox-logout"), "post", **headers)
+        assert response.status_code == 204
+        response = send_request(url, "get", **headers)
+        assert response.status_code == 401
+
+    def test_login_is_throttled_by_ip(self, settings, send_request):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"login_ip": "2/min"},
+        }
+        user = UserFactory.create()
+        url = reverse("knox-login")
+        payload = {"username": user.username, "password": "wrong"}
+
+        for _ in range(2):
+            response = send_request(url, "post", payload)
+            assert response.status_code == 400
+
+        response = send_request(url, "post", payload)
+        assert response.status_code == 429
+        assert 0 < int(response["Retry-After"]) <= 120
+
+        response = send_request(url, "post", payload, REMOTE_ADDR="10.0.0.1")
+        assert response.status_code == 400
+
+    def test_login_is_throttled_by_ip_behind_the_proxy(
+        self, settings, send_request
+    ):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"login_ip": "2/min"},
+        }
+        user = UserFactory.create()
+        url = reverse("knox-login")
+        payload = {"username": user.username, "password": "wrong"}
+
+        # The proxy appends the address of the client to the spoofed header
+        for i in range(2):
+            response = send_request(
+                url,
+                "post",
+                payload,
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{i}, 192.0.2.1",
+            )
+            assert response.status_code == 400
+
+        response = send_request(
+            url, "post", payload, HTTP_X_FORWARDED_FOR="10.0.0.2, 192.0.2.1"
+        )
+        assert response.status_code == 429
+
     def test_register(self, mocker, send_request):
         from auth.api.views import auth
 
@@ -112,38 +184,42 @@ class TestStreamAuthEndpoints:
         talk_kwargs,
         status_code,
         send_request,
+        stream_hook_url,
         talk_for_streaming,
         payload_for_streaming,
     ):
         talk = talk_for_streaming(**talk_kwargs)
-        url = reverse("stream-publish")
+        url = stream_hook_url("publish")
         payload = payload_for_streaming(talk.id, talk.stream_key)
         response = send_request(url, "post", payload)
         assert response.status_code == status_code
 
-    @pytest.mark.parametrize(
-        "endpoint_name", ["stream-publish", "stream-play"]
-    )
+    @pytest.mark.parametrize("endpoint_name", ["publish", "play"])
     def test_when_not_authenticated_then_publish_play_should_fail(
         self,
         endpoint_name,
         send_request,
+        stream_hook_url,
         talk_for_streaming,
         payload_for_streaming,
     ):
         talk = talk_for_streaming()
-        url = reverse(endpoint_name)
+        url = stream_hook_url(endpoint_name)
         payload = payload_for_streaming(talk.id)
         payload["param"] = ""
         response = send_request(url, "post", payload)
         assert response.status_code == 401
 
     def test_when_not_authorized_then_publish_should_fail(
-        self, send_request, talk_for_streaming, payload_for_streaming
+        self,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        payload_for_streaming,
     ):
         talk = talk_for_streaming()
         other_talk = talk_for_streaming()
-        url = reverse("stream-publish")
+        url = stream_hook_url("publish")
         payload = payload_for_streaming(talk.id, other_talk.stream_key)
         response = send_request(url, "post", payload)
         assert response.status_code == 403
@@ -151,43 +227,196 @@ class TestStreamAuthEndpoints:
     def test_when_not_registered_in_event_then_play_should_fail(
         self,
         send_request,
+        stream_hook_url,
         talk_for_streaming,
         play_stream_key,
         payload_for_streaming,
     ):
         play_stream_key = play_stream_key()
         talk = talk_for_streaming()
-        url = reverse("stream-play")
+        url = stream_hook_url("play")
         payload = payload_for_streaming(talk.id, play_stream_key)
         response = send_request(url, "post", payload)
         assert response.status_code == 403
 
     def test_publish(
-        self, send_request, talk_for_streaming, payload_for_streaming
+        self,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        payload_for_streaming,
     ):
         talk = talk_for_streaming()
-        url = reverse("stream-publish")
+        url = stream_hook_url("publish")
         payload = payload_for_streaming(talk.id, talk.stream_key)
         response = send_request(url, "post", payload)
         assert response.status_code == 200
-        assert response.data["code"] == 0
+        assert response.json()["code"] == 0
 
+    @pytest.mark.parametrize("signed_keys", [True, False])
     def test_play(
         self,
+        signed_keys,
+        settings,
         send_request,
+        stream_hook_url,
         talk_for_streaming,
         play_stream_key,
         payload_for_streaming,
     ):
+        settings.SIGNED_KEYS = signed_keys
         talk = talk_for_streaming()
         user = UserFactory.create()
         talk.event.attendees.add(user.pk)
         play_stream_key = play_stream_key(for_user=user)
-        url = reverse("stream-play")
+        url = stream_hook_url("play")
         payload = payload_for_streaming(talk.id, play_stream_key)
         response = send_request(url, "post", payload)
         assert response.status_code == 200
-        assert response.data["code"] == 0
+        assert response.json()["code"] == 0
+
+    @pytest.mark.parametrize(
+        "talk_id, minutes", [(None, -1), (0, 10)], ids=["expired", "other"]
+    )
+    def test_when_signed_key_is_not_valid_then_play_should_fail(
+        self,
+        talk_id,
+        minutes,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        play_stream_key,
+        payload_for_streaming,
+    ):
+        talk = talk_for_streaming()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        play_stream_key = play_stream_key(
+            for_user=user, talk_id=talk_id, minutes=minutes
+        )
+        url = stream_hook_url("play")
+        payload = payload_for_streaming(talk.id, play_stream_key)
+        response = send_request(url, "post", payload)
+        assert response.status_code == 401
+
+    def test_play_with_signed_key_of_talk(
+        self,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        play_stream_key,
+        payload_for_streaming,
+    ):
+        talk = talk_for_streaming()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        play_stream_key = play_stream_key(for_user=user, talk_id=talk.id)
+        url = stream_hook_url("play")
+        payload = payload_for_streaming(talk.id, play_stream_key)
+        response = send_request(url, "post", payload)
+        assert response.status_code == 200
+
+    def test_play_is_served_from_memory(
+        self,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        play_stream_key,
+        payload_for_streaming,
+        assert_num_queries,
+    ):
+        talk = talk_for_streaming()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        play_stream_key = play_stream_key(for_user=user)
+        url = stream_hook_url("play")
+        payload = payload_for_streaming(talk.id, play_stream_key)
+
+        # The live talks and the authorization of the user
+        with assert_num_queries(2):
+            response = send_request(url, "post", payload)
+        assert response.status_code == 200
+        with assert_num_queries(0):
+            response = send_request(url, "post", payload)
+        assert response.status_code == 200
+
+        talk.status = "rejected"
+        talk.save()
+        response = send_request(url, "post", payload)
+        assert response.status_code == 404
+
+    def test_when_attendee_is_removed_then_play_should_fail(
+        self,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        play_stream_key,
+        payload_for_streaming,
+    ):
+        talk = talk_for_streaming()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        play_stream_key = play_stream_key(for_user=user)
+        url = stream_hook_url("play")
+        payload = payload_for_streaming(talk.id, play_stream_key)
+        response = send_request(url, "post", payload)
+        assert response.status_code == 200
+
+        user.booked_events.remove(talk.event)
+        response = send_request(url, "post", payload)
+        assert response.status_code == 403
+
+    def test_play_and_stop_should_track_viewers(
+        self,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        play_stream_key,
+        payload_for_streaming,
+    ):
+        talk = talk_for_streaming()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        payload = payload_for_streaming(
+            talk.id, play_stream_key(for_user=user)
+        )
+        for client_id in ["client-1", "client-2"]:
+            response = send_request(
+                stream_hook_url("play"),
+                "post",
+                {**payload, "client_id": client_id},
+            )
+            assert response.status_code == 200
+        assert get_viewers([talk.id]) == {talk.id: (2, 1)}
+
+        payload = {
+            "stream_url": payload["stream_url"],
+            "client_id": "client-1",
+        }
+        response = send_request(stream_hook_url("stop"), "post", payload)
+        assert response.status_code == 200
+        assert get_viewers([talk.id]) == {talk.id: (1, 1)}
+
+    def test_unpublish_should_clear_viewers(
+        self,
+        send_request,
+        stream_hook_url,
+        talk_for_streaming,
+        payload_for_streaming,
+    ):
+        talk = talk_for_streaming()
+        add_viewer(talk.id, 1, "client-1")
+        url = stream_hook_url("unpublish")
+
+        payload = payload_for_streaming(talk.id, "invalid")
+        response = send_request(url, "post", payload)
+        assert response.status_code == 403
+        assert get_viewers([talk.id]) == {talk.id: (1, 1)}
+
+        payload = payload_for_streaming(talk.id, talk.stream_key)
+        response = send_request(url, "post", payload)
+        assert response.status_code == 200
+        assert get_viewers([talk.id]) == {talk.id: (0, 1)}
 
 
 class TestVerificationEndpoints:
@@ -0,0 +1,61 @@
+import pytest
+from datetime import timedelta
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.utils import timezone
+from chats.routing import websocket_urlpatterns
+from channels.routing import URLRouter
+from core.middlewares import TokenAuthMiddleware
+from users.keys import create_key
+from tests.events.factories import EventFactory
+from tests.talks.factories import TalkFactory
+
+
+@pytest.fixture(autouse=True)
+def use_in_memory_channel_layer(settings):
+    settings.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+    }
+
+
+@pytest.fixture
+def live_talk():
+    def live_talk(**kwargs):
+        now = timezone.now()
+        return TalkFactory.create(
+            event=EventFactory.create(
+                is_published=True, started_at=now - timedelta(days=1)
+            ),
+            status="approved",
+            start=now - timedelta(minutes=30),
+            end=now + timedelta(minutes=30),
+            **kwargs,
+        )
+
+    return live_talk
+
+
+@pytest.fixture
+def chat_communicator():
+    def chat_communicator(user, talk, query_string="", subprotocols=None):
+        token, _expiry = create_key(user, "chat", timedelta(minutes=10))
+        return WebsocketCommunicator(
+            TokenAuthMiddleware(URLRouter(websocket_urlpatterns)),
+            f"/ws/chats/talks/{talk.pk}/?token={token}{query_string}",
+            subprotocols=subprotocols,
+        )
+
+    return chat_communicator
+
+
+@pytest.fixture
+def connect_to_chat(chat_communicator):
+    @async_to_sync
+    async def connect_to_chat(user, talk):
+        """Connect and disconnect, and return whether it was accepted."""
+        communicator = chat_communicator(user, talk)
+        connected, _subprotocol = await communicator.connect()
+        await communicator.disconnect()
+        return connected
+
+    return connect_to_chat
@@ -0,0 +1,371 @@
+import asyncio
+import pytest
+from datetime import timedelta
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.utils import timezone
+from chats.batching import MessageBatcher
+from chats.consumers import BATCH_SUBPROTOCOL, ChatConsumer
+from chats.limits import BUCKET_CAPACITY, MESSAGE_MAX_SIZE
+from chats.messages import flush_messages, parse_stream_id
+from chats.models import Message
+from events.models import Event
+from talks.live import LiveTalkIndex
+from tests.users.factories import UserFactory
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestChatConsumer:
+    def test_when_attendee_then_connect_should_succeed(
+        self, live_talk, connect_to_chat, assert_num_queries
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+
+        # The user and the authorization
+        with assert_num_queries(2):
+            assert connect_to_chat(user, talk) is True
+        # The user, the authorization is remembered
+        with assert_num_queries(1):
+            assert connect_to_chat(user, talk) is True
+        assert connect_to_chat(talk.speaker, talk) is True
+
+    def test_when_not_attendee_then_connect_should_fail(
+        self, live_talk, connect_to_chat, mocker
+    ):
+        talk = live_talk()
+        accept = mocker.spy(ChatConsumer, "accept")
+        assert connect_to_chat(UserFactory.create(), talk) is False
+        accept.assert_not_called()
+
+    def test_when_talk_is_not_live_then_connect_should_fail(
+        self, live_talk, connect_to_chat
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        talk.event.is_published = False
+        talk.event.save()
+        assert connect_to_chat(user, talk) is False
+
+    def test_when_attendee_is_removed_then_connect_should_fail(
+        self, live_talk, connect_to_chat
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        assert connect_to_chat(user, talk) is True
+
+        talk.event.attendees.remove(user.pk)
+        assert connect_to_chat(user, talk) is False
+
+    def test_when_booking_is_cancelled_then_connect_should_fail(
+        self, live_talk, connect_to_chat, send_request
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        assert connect_to_chat(user, talk) is True
+
+        # Bookings can only be cancelled before the event starts
+        Event.objects.filter(pk=talk.event.pk).update(
+            started_at=timezone.now() + timedelta(days=1)
+        )
+        url = reverse("event-booking-list", kwargs={"pk": talk.event.pk})
+        response = send_request(url, "delete", user=user)
+        assert response.status_code == 204
+        assert connect_to_chat(user, talk) is False
+
+    def test_when_event_is_unpublished_then_connect_should_fail(
+        self, live_talk, connect_to_chat
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        assert connect_to_chat(user, talk) is True
+
+        talk.event.is_published = False
+        talk.event.save()
+        assert connect_to_chat(user, talk) is False
+
+    def test_messages_should_be_broadcast_and_stored(
+        self, live_talk, chat_communicator
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+
+        @async_to_sync
+        async def chat():
+            speaker = chat_communicator(talk.speaker, talk)
+            attendee = chat_communicator(user, talk)
+            await speaker.connect()
+            await attendee.connect()
+            for message in ["Hello", "World"]:
+                await attendee.send_json_to({"message": message})
+            received = [await speaker.receive_json_from() for _ in range(2)]
+            await speaker.disconnect()
+            await attendee.disconnect()
+            return received
+
+        received = chat()
+        assert [
+            (message["username"], message["message"]) for message in received
+        ] == [(user.username, "Hello"), (user.username, "World")]
+        assert parse_stream_id(received[0]["id"]) < parse_stream_id(
+            received[1]["id"]
+        )
+        assert not Message.objects.exists()
+
+        assert flush_messages() == 2
+        assert [
+            (message.user_id, message.message)
+            for message in Message.objects.order_by("id")
+        ] == [(user.pk, "Hello"), (user.pk, "World")]
+        assert flush_messages() == 0
+
+    def test_when_since_then_connect_should_replay_missed_messages(
+        self, live_talk, chat_communicator, assert_num_queries
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+
+        @async_to_sync
+        async def send_messages(messages):
+            communicator = chat_communicator(talk.speaker, talk)
+            await communicator.connect()
+            received = []
+            for message in messages:
+                await communicator.send_json_to({"message": message})
+                received.append(await communicator.receive_json_from())
+            await communicator.disconnect()
+            return received
+
+        @async_to_sync
+        async def reconnect(since):
+            communicator = chat_communicator(user, talk, f"&since={since}")
+            await communicator.connect()
+            received = []
+            while not await communicator.receive_nothing():
+                received.append(await communicator.receive_json_from())
+            await communicator.disconnect()
+            return received
+
+        sent = send_messages(["First", "Second", "Third"])
+        assert reconnect(sent[0]["id"]) == sent[1:]
+        # The user, the messages are replayed from Redis
+        with assert_num_queries(1):
+            assert reconnect(sent[1]["id"]) == sent[2:]
+        assert reconnect(sent[2]["id"]) == []
+        assert reconnect("invalid") == []
+
+    def test_invalid_and_large_messages_should_be_rejected(
+        self, live_talk, chat_communicator
+    ):
+        talk = live_talk()
+
+        @async_to_sync
+        async def chat():
+            communicator = chat_communicator(talk.speaker, talk)
+            await communicator.connect()
+            received = []
+            for text_data in [
+                "invalid",
+                '{"text": "Hello"}',
+                '{"message": 1}',
+                '{"message": "\\u0000"}',
+                '{"message": "%s"}' % ("a" * MESSAGE_MAX_SIZE),
+            ]:
+                await communicator.send_to(text_data=text_data)
+                received.append(await communicator.receive_json_from())
+            await communicator.send_to(bytes_data=b"Hello")
+            received.append(await communicator.receive_json_from())
+            await communicator.disconnect()
+            return received
+
+        assert chat() == [
+            {"error": "Invalid message."},
+            {"error": "Invalid message."},
+            {"error": "Invalid message."},
+            {"error": "Invalid message."},
+            {"error": "Message is too large."},
+            {"error": "Invalid message."},
+        ]
+        assert flush_messages() == 0
+
+    def test_when_bucket_is_empty_then_messages_should_be_rejected(
+        self, live_talk, chat_communicator
+    ):
+        talk = live_talk()
+
+        @async_to_sync
+        async def chat():
+            communicator = chat_communicator(talk.speaker, talk)
+            await communicator.connect()
+            received = []
+            for i in range(BUCKET_CAPACITY + 1):
+                await communicator.send_json_to({"message": f"Message {i}"})
+                received.append(await communicator.receive_json_from())
+            await communicator.disconnect()
+            return received
+
+        received = chat()
+        assert [message.get("message") for message in received] == [
+            f"Message {i}" for i in range(BUCKET_CAPACITY)
+        ] + [None]
+        assert received[-1] == {"error": "Too many messages."}
+
+    def test_when_slow_mode_then_messages_should_be_rejected(
+        self, live_talk, chat_communicator, mocker
+    ):
+        talk = live_talk(slow_mode=30)
+        # The index is reloaded through database_sync_to_async
+        load = mocker.spy(LiveTalkIndex, "load")
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+
+        @async_to_sync
+        async def chat():
+            communicators = [
+                chat_communicator(user, talk),
+                chat_communicator(talk.speaker, talk),
+            ]
+            received = []
+            for communicator in communicators:
+                await communicator.connect()
+            for communicator in [*communicators, communicators[0]]:
+                await communicator.send_json_to({"message": "Hello"})
+                received.append(await communicator.receive_json_from())
+            for communicator in communicators:
+                await communicator.disconnect()
+            return received
+
+        received = chat()
+        assert [message.get("message") for message in received[:2]] == [
+            "Hello",
+            "Hello",
+        ]
+        assert received[2] == {
+            "error": "Slow mode is on, wait 30 seconds between messages."
+        }
+        load.assert_called()
+
+    @pytest.mark.parametrize(
+        "query_string, subprotocols, accepted_subprotocol",
+        [
+            ("&batch=true", None, None),
+            ("", [BATCH_SUBPROTOCOL], BATCH_SUBPROTOCOL),
+        ],
+    )
+    def test_when_batch_then_messages_should_be_sent_in_batches(
+        self,
+        query_string,
+        subprotocols,
+        accepted_subprotocol,
+        live_talk,
+        chat_communicator,
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+
+        @async_to_sync
+        async def chat():
+            sender = chat_communicator(talk.speaker, talk)
+            receiver = chat_communicator(
+                user, talk, query_string, subprotocols
+            )
+            await sender.connect()
+            _connected, subprotocol = await receiver.connect()
+            for i in range(3):
+                await sender.send_json_to({"message": f"Message {i}"})
+            sent = [await sender.receive_json_from() for _ in range(3)]
+            received = await receiver.receive_json_from()
+            assert await receiver.receive_nothing()
+            await sender.disconnect()
+            await receiver.disconnect()
+            return subprotocol, sent, received
+
+        subprotocol, sent, received = chat()
+        assert subprotocol == accepted_subprotocol
+        assert received == sent
+
+    def test_when_no_batch_subscribers_then_messages_should_not_be_batched(
+        self, live_talk, chat_communicator, mocker
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        add = mocker.spy(MessageBatcher, "add")
+
+        @async_to_sync
+        async def chat():
+            sender = chat_communicator(talk.speaker, talk)
+            await sender.connect()
+            await sender.send_json_to({"message": "Not batched"})
+            await sender.receive_json_from()
+            assert add.call_count == 0
+
+            receiver = chat_communicator(user, talk, "&batch=true")
+            await receiver.connect()
+            await sender.send_json_to({"message": "Batched"})
+            await sender.receive_json_from()
+            await receiver.receive_json_from()
+            assert add.call_count == 1
+
+            await receiver.disconnect()
+            await sender.send_json_to({"message": "Not batched"})
+            await sender.receive_json_from()
+            assert add.call_count == 1
+            await sender.disconnect()
+
+        chat()
+
+    def test_when_batch_fails_then_error_should_be_logged(
+        self, mocker, caplog
+    ):
+        channel_layer = mocker.Mock()
+        channel_layer.group_send = mocker.AsyncMock(
+            side_effect=ConnectionError
+        )
+
+        @async_to_sync
+        async def send_batch():
+            batcher = MessageBatcher()
+            batcher.add(channel_layer, "talk_1_batch", {"id": "1-0"})
+            await asyncio.gather(*batcher.tasks)
+
+        send_batch()
+        assert "Failed to send 1 chat messages to talk_1_batch" in caplog.text
+
+    def test_when_batch_and_since_then_replay_should_be_one_batch(
+        self, live_talk, chat_communicator
+    ):
+        talk = live_talk()
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+
+        @async_to_sync
+        async def chat():
+            sender = chat_communicator(talk.speaker, talk)
+            await sender.connect()
+            for i in range(3):
+                await sender.send_json_to({"message": f"Message {i}"})
+            sent = [await sender.receive_json_from() for _ in range(3)]
+            await sender.disconnect()
+
+            receiver = chat_communicator(
+                user, talk, f"&batch=true&since={sent[0]['id']}"
+            )
+            await receiver.connect()
+            received = await receiver.receive_json_from()
+            # The batch of the sent messages is not sent again
+            assert await receiver.receive_nothing(timeout=0.2)
+            await receiver.disconnect()
+            return sent, received
+
+        sent, received = chat()
+        assert received == sent[1:]
@@ -0,0 +1,96 @@
+import pytest
+from asgiref.sync import async_to_sync
+from chats.messages import (
+    REJECTED_MESSAGES_KEY,
+    append_message,
+    flush_messages,
+    get_messages_key,
+    get_pending_messages_key,
+)
+from chats.models import Message
+from core.redis import get_redis
+from tests.talks.factories import TalkFactory
+from tests.users.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestChatMessages:
+    def test_flush_messages_in_batches(self, assert_num_queries):
+        talks = TalkFactory.create_batch(2)
+        user = UserFactory.create()
+        for i in range(3):
+            async_to_sync(append_message)(talks[0].pk, user, f"Message {i}")
+        async_to_sync(append_message)(talks[1].pk, user, "Message")
+
+        # The talks, the users and the messages
+        with assert_num_queries(3):
+            assert flush_messages(batch_size=2) == 3
+        assert flush_messages(batch_size=2) == 1
+        assert flush_messages(batch_size=2) == 0
+        assert list(
+            Message.objects.filter(talk=talks[0])
+            .order_by("id")
+            .values_list("message", flat=True)
+        ) == ["Message 0", "Message 1", "Message 2"]
+        assert Message.objects.filter(talk=talks[1]).count() == 1
+
+    def test_flush_messages_should_not_lose_trimmed_messages(self, mocker):
+        mocker.patch("chats.messages.MESSAGES_MAXLEN", 10)
+        talk = TalkFactory.create()
+        user = UserFactory.create()
+        for i in range(250):
+            async_to_sync(append_message)(talk.pk, user, f"Message {i}")
+
+        # The replay stream was trimmed before the messages were flushed
+        assert get_redis().xlen(get_messages_key(talk.pk)) < 250
+        assert flush_messages() == 250
+        assert Message.objects.filter(talk=talk).count() == 250
+        assert get_redis().xlen(get_pending_messages_key(talk.pk)) == 0
+
+    def test_flush_messages_should_drop_messages_of_deleted_talks(self):
+        talks = TalkFactory.create_batch(2)
+        user = UserFactory.create()
+        for talk in talks:
+            async_to_sync(append_message)(talk.pk, user, "Message")
+        talks[0].delete()
+
+        assert flush_messages() == 2
+        assert list(Message.objects.values_list("talk_id", flat=True)) == [
+            talks[1].pk
+        ]
+
+    def test_flush_messages_should_be_idempotent(self, mocker):
+        talk = TalkFactory.create()
+        user = UserFactory.create()
+        async_to_sync(append_message)(talk.pk, user, "Message")
+
+        # The messages are inserted, but not deleted from the stream
+        pipeline = mocker.patch.object(
+            get_redis(), "pipeline", side_effect=ConnectionError
+        )
+        with pytest.raises(ConnectionError):
+            flush_messages()
+        mocker.stop(pipeline)
+
+        assert flush_messages() == 1
+        assert Message.objects.count() == 1
+
+    def test_flush_messages_should_set_aside_refused_messages(self):
+        talks = TalkFactory.create_batch(2)
+        user = UserFactory.create()
+        async_to_sync(append_message)(talks[0].pk, user, "Before")
+        async_to_sync(append_message)(talks[0].pk, user, "Null \x00")
+        async_to_sync(append_message)(talks[0].pk, user, "After")
+        async_to_sync(append_message)(talks[1].pk, user, "Message")
+
+        assert flush_messages() == 4
+        assert flush_messages() == 0
+        assert sorted(Message.objects.values_list("message", flat=True)) == [
+            "After",
+            "Before",
+            "Message",
+        ]
+        [(_id, fields)] = get_redis().xrange(REJECTED_MESSAGES_KEY)
+        assert fields[b"talk"] == str(talks[0].pk).encode()
+        assert fields[b"message"] == "Null \x00".encode()
@@ -1,6 +1,11 @@
 import pytest
+from contextlib import contextmanager
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework.serializers import DateTimeField
+from core.redis import get_redis
 
 
 @pytest.fixture
@@ -44,3 +49,43 @@ def disable_celery(mocker):
 
     mocker.stop(delay_patch)
     mocker.stop(apply_async_patch)
+
+
+@pytest.fixture(autouse=True)
+def use_local_memory_cache(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def use_test_redis(settings):
+    # Keep the data of the tests apart from the data of the development
+    settings.REDIS_URL = f"{settings.REDIS_URL}/15"
+    get_redis().flushdb()
+    yield
+    get_redis().flushdb()
+
+
+@pytest.fixture
+def assert_num_queries():
+    @contextmanager
+    def assert_num_queries(num):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        # Silk records the requests and explains their queries when DEBUG
+        # is on, so its own queries are left out of the count.
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "silk_" not in query["sql"]
+            and not query["sql"].startswith(
+                ("EXPLAIN", "SAVEPOINT", "RELEASE SAVEPOINT")
+            )
+        ]
+        assert len(queries) == num, "\n".join(queries)
+
+    return assert_num_queries
@@ -0,0 +1,111 @@
+import pytest
+from django.core import mail
+from core.mails import (
+    MAIL_MAX_ATTEMPTS,
+    acquire_sending_lock,
+    pop_pending_mails,
+    queue_mail,
+    queue_mails,
+    requeue_mails,
+    take_pending_mails,
+)
+from core.tasks import send_mail_task, send_pending_mails_task
+
+
+class TestCoreTasks:
+    def test_send_pending_mails(self, mocker):
+        from celery.app.task import Task
+
+        queue_mails(
+            [(f"Subject {i}", "Message", [f"user{i}@x.com"]) for i in range(3)]
+        )
+        queue_mail("Subject 3", "Message", ["user3@x.com"])
+        Task.apply_async.assert_called_once()
+
+        connection = mocker.patch("core.tasks.get_connection").return_value
+        result = send_pending_mails_task()
+
+        assert result == {"sent": 4, "failed": 0}
+        sent_emails = [
+            call.args[0][0] for call in connection.send_messages.call_args_list
+        ]
+        assert [email.to for email in sent_emails] == [
+            [f"user{i}@x.com"] for i in range(4)
+        ]
+        connection.close.assert_called_once()
+        assert pop_pending_mails() == []
+
+    @pytest.mark.parametrize("attempts", [0, MAIL_MAX_ATTEMPTS - 1])
+    def test_send_pending_mails_retries_failed_mails(self, attempts, mocker):
+        queue_mails([("Fails", "Message", ["a@x.com"])])
+        queue_mails([("Succeeds", "Message", ["b@x.com"])])
+        mails = pop_pending_mails()
+        mails[0]["attempts"] = attempts
+        requeue_mails(mails)
+
+        def send_messages(emails):
+            if emails[0].subject == "Fails":
+                raise ConnectionError()
+            mail.outbox.extend(emails)
+            return 1
+
+        connection = mocker.patch("core.tasks.get_connection").return_value
+        connection.send_messages.side_effect = send_messages
+        result = send_pending_mails_task()
+
+        assert [email.subject for email in mail.outbox] == ["Succeeds"]
+        if attempts + 1 < MAIL_MAX_ATTEMPTS:
+            assert result == {"sent": 1, "failed": 1}
+            requeued = pop_pending_mails()
+            assert requeued == [{**mails[0], "attempts": attempts + 1}]
+        else:
+            assert result == {"sent": 1, "failed": 0}
+            assert pop_pending_mails() == []
+
+    def test_send_pending_mails_sends_the_mails_of_a_killed_sender(
+        self, mocker
+    ):
+        queue_mails([("Taken", "Message", ["a@x.com"])])
+        # A sender took the mail, then was killed along with its lock
+        take_pending_mails()
+        queue_mails([("Queued", "Message", ["b@x.com"])])
+
+        connection = mocker.patch("core.tasks.get_connection").return_value
+        result = send_pending_mails_task()
+
+        assert result == {"sent": 2, "failed": 0}
+        sent_emails = [
+            call.args[0][0] for call in connection.send_messages.call_args_list
+        ]
+        assert [email.subject for email in sent_emails] == ["Taken", "Queued"]
+        assert take_pending_mails() == []
+
+    def test_send_pending_mails_waits_for_the_running_sender(self, mocker):
+        from celery.app.task import Task
+
+        queue_mails([("Subject", "Message", ["a@x.com"])])
+        Task.apply_async.reset_mock()
+        acquire_sending_lock()
+
+        connection = mocker.patch("core.tasks.get_connection").return_value
+        result = send_pending_mails_task()
+
+        assert result == {"sent": 0, "failed": 0}
+        connection.send_messages.assert_not_called()
+        Task.apply_async.assert_called_once()
+        assert len(pop_pending_mails()) == 1
+
+    def test_send_mail_queues_the_mail(self):
+        from celery.app.task import Task
+
+        send_mail_task("Subject", "Message", ["a@x.com"])
+
+        Task.apply_async.assert_called_once()
+        assert pop_pending_mails() == [
+            {
+                "subject": "Subject",
+                "message": "Message",
+                "recipient_list": ["a@x.com"],
+                "attempts": 0,
+            }
+        ]
@@ -1,4 +1,5 @@
 import pytest
+from core.images import IMAGE_VARIANTS
 from .factories import EventFactory
 
 
@@ -22,6 +23,7 @@ def get_event_representation(get_datetime_representation):
             "description": event.description,
             "is_published": event.is_published,
             "started_at": get_datetime_representation(event.started_at),
+            "capacity": event.capacity,
         }
         if include_id:
             representation["id"] = event.id
@@ -29,6 +31,9 @@ def get_event_representation(get_datetime_representation):
             representation["organizer"] = event.organizer.username
         if include_picture:
             representation["picture"] = event.picture.url
+            representation["picture_variants"] = {
+                variant: event.picture.url for variant in IMAGE_VARIANTS
+            }
         return representation
 
     return get_event_representation
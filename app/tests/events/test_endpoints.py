@@ -1,4 +1,7 @@
 import pytest
+from io import BytesIO
+from PIL import Image
+from django.core.files.base import ContentFile
 from django.utils import timezone
 from django.urls import reverse
 from tests.users.factories import UserFactory
@@ -6,6 +9,8 @@ from tests.events.factories import EventFactory
 from tests.talks.factories import TalkFactory
 from tests.talks.conftest import get_talk_representation
 from events.models import Event
+from core.images import IMAGE_VARIANTS
+from core.mails import pop_pending_mails
 
 pytestmark = pytest.mark.django_db
 __all__ = ["get_talk_representation"]
@@ -199,6 +204,197 @@ class TestEventEndpoints:
         assert response.status_code == 200
         assert len(response.data["results"]) == 3
 
+    def test_list_events_is_booked(self, send_request):
+        user = UserFactory.create()
+        booked_event, other_event = EventFactory.create_batch(
+            2, is_published=True
+        )
+        booked_event.attendees.add(user)
+
+        url = reverse("event-list")
+        response = send_request(url, "get", user=user)
+
+        assert response.status_code == 200
+        is_booked = {
+            event["id"]: event["is_booked"]
+            for event in response.data["results"]
+        }
+        assert is_booked == {booked_event.id: True, other_event.id: False}
+
+    @pytest.mark.parametrize("authenticated", [False, True])
+    def test_list_events_query_count(
+        self, authenticated, send_request, assert_num_queries
+    ):
+        user = UserFactory.create() if authenticated else None
+        events = EventFactory.create_batch(5, is_published=True)
+        for event in events:
+            event.attendees.add(UserFactory.create())
+
+        url = reverse("event-list")
+        with assert_num_queries(1):
+            response = send_request(url, "get", user=user)
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 5
+
+        # One query for the count and one for the page
+        with assert_num_queries(2):
+            response = send_request(f"{url}?limit=20", "get", user=user)
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 5
+
+    def test_list_events_is_served_from_cache(
+        self, send_request, assert_num_queries
+    ):
+        user = UserFactory.create()
+        booked_event, other_event = EventFactory.create_batch(
+            2, is_published=True
+        )
+        booked_event.attendees.add(user)
+
+        url = reverse("event-list")
+        send_request(url, "get")
+        send_request(url, "get", user=user)
+
+        with assert_num_queries(0):
+            response = send_request(url, "get")
+        assert response.status_code == 200
+        assert [event["is_booked"] for event in response.data["results"]] == [
+            False,
+            False,
+        ]
+
+        with assert_num_queries(0):
+            response = send_request(url, "get", user=user)
+        is_booked = {
+            event["id"]: event["is_booked"]
+            for event in response.data["results"]
+        }
+        assert is_booked == {booked_event.id: True, other_event.id: False}
+
+    def test_booking_invalidates_cached_is_booked(self, send_request):
+        user = UserFactory.create()
+        event = EventFactory.create(
+            is_published=True,
+            started_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        list_url = reverse("event-list")
+        booking_url = reverse("event-booking-list", kwargs={"pk": event.pk})
+
+        response = send_request(list_url, "get", user=user)
+        assert response.data["results"][0]["is_booked"] is False
+
+        send_request(booking_url, "post", user=user)
+        response = send_request(list_url, "get", user=user)
+        assert response.data["results"][0]["is_booked"] is True
+
+        send_request(booking_url, "delete", user=user)
+        response = send_request(list_url, "get", user=user)
+        assert response.data["results"][0]["is_booked"] is False
+
+    def test_attendees_manager_invalidates_cached_is_booked(
+        self, send_request
+    ):
+        user = UserFactory.create()
+        event = EventFactory.create(is_published=True)
+        url = reverse("event-list")
+
+        def is_booked():
+            response = send_request(url, "get", user=user)
+            return response.data["results"][0]["is_booked"]
+
+        assert is_booked() is False
+        event.attendees.add(user)
+        assert is_booked() is True
+        event.attendees.clear()
+        assert is_booked() is False
+        user.booked_events.add(event)
+        assert is_booked() is True
+        user.booked_events.remove(event)
+        assert is_booked() is False
+
+    def test_event_changes_invalidate_cached_events(self, send_request):
+        event = EventFactory.create(is_published=True)
+        draft = EventFactory.create(is_published=False)
+        url = reverse("event-list")
+
+        response = send_request(url, "get")
+        assert [e["id"] for e in response.data["results"]] == [event.id]
+
+        event.title = "New title"
+        event.save()
+        response = send_request(url, "get")
+        assert response.data["results"][0]["title"] == "New title"
+
+        draft.is_published = True
+        draft.save()
+        response = send_request(url, "get")
+        assert len(response.data["results"]) == 2
+
+        Event.objects.get(pk=draft.pk).delete()
+        response = send_request(url, "get")
+        assert [e["id"] for e in response.data["results"]] == [event.id]
+
+    @pytest.mark.parametrize("only_upcoming", [False, True])
+    def test_list_events_cursor_pagination(self, only_upcoming, send_request):
+        now = timezone.now()
+        events = [
+            EventFactory.create(
+                is_published=True,
+                started_at=now + timezone.timedelta(days=days),
+            )
+            for days in range(1, 26)
+        ]
+        # Events that share started_at are ordered by id
+        events.append(
+            EventFactory.create(
+                is_published=True, started_at=events[-1].started_at
+            )
+        )
+        if only_upcoming:
+            EventFactory.create(
+                is_published=True, started_at=now - timezone.timedelta(days=1)
+            )
+        else:
+            events.reverse()
+
+        url = reverse("event-list")
+        url = f"{url}?only_upcoming={str(only_upcoming).lower()}"
+        response = send_request(url, "get")
+        assert response.status_code == 200
+        assert "count" not in response.data
+        first_page = response.data["results"]
+        assert len(first_page) == 20
+
+        response = send_request(response.data["next"], "get")
+        assert response.status_code == 200
+        assert response.data["next"] is None
+        second_page = response.data["results"]
+
+        ids = [event["id"] for event in first_page + second_page]
+        assert ids == [event.id for event in events]
+
+    def test_list_events_limit_offset_pagination(self, send_request):
+        EventFactory.create_batch(5, is_published=True)
+        url = reverse("event-list")
+        response = send_request(f"{url}?limit=2&offset=1", "get")
+        assert response.status_code == 200
+        assert response.data["count"] == 5
+        assert len(response.data["results"]) == 2
+
+    @pytest.mark.parametrize("authenticated", [False, True])
+    def test_retrieve_event_query_count(
+        self,
+        authenticated,
+        published_event,
+        send_request,
+        assert_num_queries,
+    ):
+        user = UserFactory.create() if authenticated else None
+        url = reverse("event-detail", kwargs={"pk": published_event.pk})
+        with assert_num_queries(1):
+            response = send_request(url, "get", user=user)
+        assert response.status_code == 200
+
     def test_filter_upcoming_events(
         self, send_request, get_event_representation
     ):
@@ -227,9 +423,58 @@ class TestEventEndpoints:
             include_organizer=True,
             include_picture=True,
         )
+        expected_response_data["attendee_count"] = 0
         expected_response_data["is_booked"] = False
         assert response.data["results"][0] == expected_response_data
 
+    def test_search_events(self, send_request):
+        description_match = EventFactory.create(
+            is_published=True,
+            title="Weekly meetup",
+            description="Talks about databases and indexing.",
+        )
+        title_match = EventFactory.create(
+            is_published=True,
+            title="Database conference",
+            description="Two days of talks.",
+        )
+        EventFactory.create(
+            is_published=False,
+            title="Database workshop",
+            description="Draft.",
+        )
+        EventFactory.create(
+            is_published=True,
+            title="Design systems",
+            description="Components and tokens.",
+        )
+
+        url = reverse("event-list")
+        response = send_request(f"{url}?search=databases", "get")
+
+        assert response.status_code == 200
+        assert response.data["count"] == 2
+        assert [event["id"] for event in response.data["results"]] == [
+            title_match.id,
+            description_match.id,
+        ]
+
+    def test_search_vector_is_updated_only_when_text_changes(
+        self, assert_num_queries
+    ):
+        event = EventFactory.create(title="Weekly meetup")
+        event = Event.objects.get(pk=event.pk)
+
+        event.is_published = True
+        # The event, the search vector is left as it is
+        with assert_num_queries(1):
+            event.save()
+
+        event.title = "Database conference"
+        with assert_num_queries(2):
+            event.save()
+        assert Event.objects.search("database").get() == event
+
     def test_create_event(self, send_request, get_event_representation):
         event = EventFactory.build(
             organizer=UserFactory.create(),
@@ -246,6 +491,7 @@ class TestEventEndpoints:
         expected_reponse_data = payload
         expected_reponse_data["organizer"] = event.organizer.username
         expected_reponse_data["picture"] = None
+        expected_reponse_data["picture_variants"] = None
         assert response.data == expected_reponse_data
 
     def test_when_unpublished_then_organizer_can_retrieve_event(
@@ -259,6 +505,7 @@ class TestEventEndpoints:
             include_organizer=True,
             include_picture=True,
         )
+        expected_response_data["attendee_count"] = 0
         expected_response_data["is_booked"] = False
         assert response.status_code == 200
         assert response.data == expected_response_data
@@ -274,10 +521,108 @@ class TestEventEndpoints:
             include_organizer=True,
             include_picture=True,
         )
+        expected_response_data["attendee_count"] = 0
         expected_response_data["is_booked"] = False
         assert response.status_code == 200
         assert response.data == expected_response_data
 
+    def test_retrieve_event_conditional_get(
+        self, send_request, assert_num_queries
+    ):
+        user = UserFactory.create()
+        event = EventFactory.create(
+            is_published=True,
+            started_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        url = reverse("event-detail", kwargs={"pk": event.pk})
+
+        response = send_request(url, "get", user=user)
+        assert response.status_code == 200
+        etag = response["ETag"]
+
+        with assert_num_queries(1):
+            response = send_request(
+                url, "get", user=user, HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == 304
+
+        response = send_request(
+            url,
+            "get",
+            user=UserFactory.create(),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == 200
+
+        booking_url = reverse("event-booking-list", kwargs={"pk": event.pk})
+        send_request(booking_url, "post", user=user)
+        response = send_request(url, "get", user=user, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["is_booked"] is True
+
+    def test_list_event_talks_conditional_get(
+        self, published_event, send_request
+    ):
+        talk = TalkFactory.create(event=published_event, status="approved")
+        url = reverse("event-list-talks", kwargs={"pk": published_event.pk})
+
+        response = send_request(url, "get")
+        assert response.status_code == 200
+        etag = response["ETag"]
+        last_modified = response["Last-Modified"]
+
+        response = send_request(url, "get", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        response = send_request(
+            url, "get", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == 304
+
+        talk.delete()
+        response = send_request(url, "get", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 0
+
+    def test_picture_variants(
+        self,
+        settings,
+        tmp_path,
+        send_request,
+        django_capture_on_commit_callbacks,
+    ):
+        from celery.app.task import Task
+        from core.tasks import generate_image_variants_task
+
+        settings.MEDIA_ROOT = tmp_path
+        content = BytesIO()
+        Image.new("RGB", (1200, 800), "blue").save(content, format="PNG")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            event = EventFactory.create(
+                is_published=True,
+                picture=ContentFile(content.getvalue(), name="picture.png"),
+            )
+        Task.delay.assert_called_once_with("events.Event", event.pk, "picture")
+
+        url = reverse("event-detail", kwargs={"pk": event.pk})
+        response = send_request(url, "get")
+        assert response.data["picture_variants"]["thumbnail"] == (
+            event.picture.url
+        )
+
+        generate_image_variants_task("events.Event", event.pk, "picture")
+
+        response = send_request(url, "get")
+        variants = response.data["picture_variants"]
+        assert variants["thumbnail"].endswith("_thumbnail.png")
+        assert variants["thumbnail_webp"].endswith("_thumbnail_webp.webp")
+        assert variants["webp"].endswith("_webp.webp")
+
+        event.refresh_from_db()
+        thumbnail = event.picture_variants["thumbnail"]
+        with Image.open(tmp_path / thumbnail) as image:
+            assert image.size == (320, 213)
+
     def test_update_event(self, send_request, get_event_representation):
         event = EventFactory.create(is_published=False)
 
@@ -295,6 +640,9 @@ class TestEventEndpoints:
         excepted_response_data["id"] = event.id
         excepted_response_data["organizer"] = event.organizer.username
         excepted_response_data["picture"] = event.picture.url
+        excepted_response_data["picture_variants"] = {
+            variant: event.picture.url for variant in IMAGE_VARIANTS
+        }
         assert response.data == excepted_response_data
 
     @pytest.mark.parametrize(
@@ -362,6 +710,92 @@ class TestEventEndpoints:
         response = send_request(url, "delete", user=user)
         assert response.status_code == 409
 
+    @pytest.mark.parametrize("method", ["post", "delete"])
+    def test_booking_endpoints_query_count(
+        self, method, send_request, assert_num_queries
+    ):
+        user = UserFactory.create()
+        event = EventFactory.create(
+            is_published=True,
+            started_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        if method == "delete":
+            event.attendees.add(user)
+        url = reverse("event-booking-list", kwargs={"pk": event.pk})
+
+        # One query for the event and one for the booking, and the talks
+        # whose chat authorizations are revoked when it is cancelled
+        with assert_num_queries(2 if method == "post" else 3):
+            response = send_request(url, method, user=user)
+        assert response.status_code == 204
+        with assert_num_queries(2):
+            response = send_request(url, method, user=user)
+        assert response.status_code == 409
+
+    def test_event_booking_updates_attendee_count(self, send_request):
+        users = UserFactory.create_batch(2)
+        event = EventFactory.create(
+            is_published=True,
+            started_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        booking_url = reverse("event-booking-list", kwargs={"pk": event.pk})
+        detail_url = reverse("event-detail", kwargs={"pk": event.pk})
+
+        for user in users:
+            send_request(booking_url, "post", user=user)
+        response = send_request(detail_url, "get")
+        assert response.data["attendee_count"] == 2
+
+        # A rejected booking should not change the count
+        send_request(booking_url, "post", user=users[0])
+        send_request(booking_url, "delete", user=users[0])
+        send_request(booking_url, "delete", user=users[0])
+        response = send_request(detail_url, "get")
+        assert response.data["attendee_count"] == 1
+
+    def test_when_event_is_fully_booked_then_create_booking_should_fail(
+        self, send_request
+    ):
+        event = EventFactory.create(
+            is_published=True,
+            started_at=timezone.now() + timezone.timedelta(days=1),
+            capacity=1,
+        )
+        url = reverse("event-booking-list", kwargs={"pk": event.pk})
+
+        response = send_request(url, "post", user=UserFactory.create())
+        assert response.status_code == 204
+
+        user = UserFactory.create()
+        response = send_request(url, "post", user=user)
+        assert response.status_code == 409
+        assert not event.attendees.filter(pk=user.pk).exists()
+        event.refresh_from_db()
+        assert event.attendee_count == 1
+
+    def test_when_capacity_is_less_than_attendees_then_update_should_fail(
+        self, send_request
+    ):
+        event = EventFactory.create(is_published=False)
+        event.attendees.add(*UserFactory.create_batch(2))
+        url = reverse("event-detail", kwargs={"pk": event.pk})
+        response = send_request(
+            url, "patch", {"capacity": 1}, user=event.organizer
+        )
+        assert response.status_code == 400
+
+    def test_attendees_manager_updates_attendee_count(self):
+        event = EventFactory.create()
+        user = UserFactory.create()
+
+        event.attendees.add(user, UserFactory.create())
+        event.refresh_from_db()
+        assert event.attendee_count == 2
+
+        user.booked_events.clear()
+        event.refresh_from_db()
+        assert event.attendee_count == 1
+
     def test_list_published_event_talks(self, published_event, send_request):
         TalkFactory.create_batch(3, event=published_event, status="approved")
         TalkFactory.create_batch(2, event=published_event, status="rejected")
@@ -371,7 +805,7 @@ class TestEventEndpoints:
         response = send_request(url, "get")
 
         assert response.status_code == 200
-        assert len(response.data) == 3
+        assert len(response.data["results"]) == 3
 
     def test_filter_event_talks(self, published_event, send_request):
         TalkFactory.create_batch(3, event=published_event, status="approved")
@@ -385,12 +819,82 @@ class TestEventEndpoints:
         url = f"{base_url}?include_all=true"
         response = send_request(url, "get", user=published_event.organizer)
         assert response.status_code == 200
-        assert len(response.data) == 6
+        assert len(response.data["results"]) == 6
 
         url = f"{base_url}?include_all=false"
         response = send_request(url, "get", user=published_event.organizer)
         assert response.status_code == 200
-        assert len(response.data) == 3
+        assert len(response.data["results"]) == 3
+
+    def test_list_event_talks_query_count(
+        self, published_event, send_request, assert_num_queries
+    ):
+        TalkFactory.create_batch(5, event=published_event, status="approved")
+        url = reverse("event-list-talks", kwargs={"pk": published_event.pk})
+
+        # The event, the talks with their speakers
+        with assert_num_queries(2):
+            response = send_request(url, "get")
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 5
+
+    def test_list_event_talks_pagination(
+        self, published_event, send_request, mocker
+    ):
+        from talks.api.pagination import TalkCursorPagination
+
+        mocker.patch.object(TalkCursorPagination, "page_size", 2)
+        start = timezone.now() + timezone.timedelta(days=1)
+        talks = [
+            TalkFactory.create(
+                event=published_event,
+                start=start + timezone.timedelta(hours=hours),
+                end=start + timezone.timedelta(hours=hours + 1),
+                status="approved",
+            )
+            for hours in [2, 0, 1]
+        ]
+        talks.sort(key=lambda talk: talk.start)
+        url = reverse("event-list-talks", kwargs={"pk": published_event.pk})
+
+        response = send_request(url, "get")
+        first_page = response.data["results"]
+        assert len(first_page) == 2
+
+        response = send_request(response.data["next"], "get")
+        assert response.data["next"] is None
+        results = first_page + response.data["results"]
+        assert [talk["id"] for talk in results] == [talk.pk for talk in talks]
+
+    def test_filter_event_talks_by_time_window(
+        self, published_event, send_request
+    ):
+        start = timezone.now() + timezone.timedelta(days=1)
+        talks = [
+            TalkFactory.create(
+                event=published_event,
+                start=start + timezone.timedelta(hours=hours),
+                end=start + timezone.timedelta(hours=hours + 1),
+                status="approved",
+            )
+            for hours in range(4)
+        ]
+        url = reverse("event-list-talks", kwargs={"pk": published_event.pk})
+        window_start = (start + timezone.timedelta(minutes=90)).isoformat()
+        window_end = (start + timezone.timedelta(hours=3)).isoformat()
+
+        response = send_request(
+            url, "get", {"from": window_start, "to": window_end}
+        )
+        assert response.status_code == 200
+        assert [talk["id"] for talk in response.data["results"]] == [
+            talks[1].pk,
+            talks[2].pk,
+        ]
+
+        response = send_request(url, "get", {"from": "now"})
+        assert response.status_code == 400
+        assert "from" in response.data
 
     def test_create_event_talk(
         self, unpublished_event, send_request, get_talk_representation, mocker
@@ -426,3 +930,169 @@ class TestEventEndpoints:
         assert get_talk_representation(
             talk_arg, include_speaker=True
         ) == get_talk_representation(talk, include_speaker=True)
+
+    @pytest.mark.parametrize(
+        "status, status_code", [("approved", 400), ("rejected", 201)]
+    )
+    def test_when_talk_collides_then_create_event_talk_should_fail(
+        self,
+        status,
+        status_code,
+        unpublished_event,
+        send_request,
+        get_talk_representation,
+    ):
+        start = timezone.now() + timezone.timedelta(days=1)
+        TalkFactory.create(
+            event=unpublished_event,
+            start=start,
+            end=start + timezone.timedelta(hours=1),
+            status=status,
+        )
+        talk = TalkFactory.build(
+            speaker=UserFactory.create(),
+            event=unpublished_event,
+            start=start + timezone.timedelta(minutes=30),
+            end=start + timezone.timedelta(minutes=90),
+        )
+
+        url = reverse("event-list-talks", kwargs={"pk": unpublished_event.pk})
+        payload = get_talk_representation(talk, include_speaker=True)
+        response = send_request(
+            url, "post", payload, user=unpublished_event.organizer
+        )
+
+        assert response.status_code == status_code
+        if status_code == 400:
+            assert response.data == {
+                "non_field_errors": ["Talk collides with other talks."]
+            }
+
+    def test_create_event_talks_bulk(
+        self,
+        unpublished_event,
+        send_request,
+        get_talk_representation,
+        assert_num_queries,
+    ):
+        from celery.app.task import Task
+
+        start = timezone.now() + timezone.timedelta(days=1)
+        talks = [
+            TalkFactory.build(
+                speaker=UserFactory.create(),
+                event=unpublished_event,
+                start=start + timezone.timedelta(hours=hours),
+                end=start + timezone.timedelta(hours=hours + 1),
+                status="pending",
+            )
+            for hours in [2, 0, 1]
+        ]
+
+        url = reverse("event-bulk-talks", kwargs={"pk": unpublished_event.pk})
+        payload = [
+            get_talk_representation(talk, include_speaker=True)
+            for talk in talks
+        ]
+        # The event, the speakers, the colliding talks, the insert of the
+        # talks, the touch of the event, and the organizer for the mails
+        with assert_num_queries(6):
+            response = send_request(
+                url, "post", payload, user=unpublished_event.organizer
+            )
+
+        assert response.status_code == 201
+        for talk_data in response.data:
+            talk_data.pop("id")
+        assert response.data == [
+            get_talk_representation(
+                talk, include_event=True, include_status=True
+            )
+            for talk in talks
+        ]
+        assert unpublished_event.talk_set.count() == 3
+        Task.apply_async.assert_called_once()
+        mails = pop_pending_mails()
+        assert [mail["recipient_list"] for mail in mails] == [
+            [talk.speaker.email] for talk in talks
+        ]
+
+    @pytest.mark.parametrize("existing", [False, True])
+    def test_when_talks_collide_then_create_event_talks_bulk_should_fail(
+        self,
+        existing,
+        unpublished_event,
+        send_request,
+        get_talk_representation,
+    ):
+        start = timezone.now() + timezone.timedelta(days=1)
+        talks = [
+            TalkFactory.build(
+                speaker=UserFactory.create(),
+                event=unpublished_event,
+                start=start + timezone.timedelta(minutes=minutes),
+                end=start + timezone.timedelta(minutes=minutes + 60),
+            )
+            for minutes in [0, 90, 120]
+        ]
+        if existing:
+            talks[2].start += timezone.timedelta(minutes=30)
+            talks[2].end += timezone.timedelta(minutes=30)
+            TalkFactory.create(
+                event=unpublished_event,
+                start=start + timezone.timedelta(minutes=170),
+                end=start + timezone.timedelta(minutes=200),
+                status="approved",
+            )
+
+        url = reverse("event-bulk-talks", kwargs={"pk": unpublished_event.pk})
+        payload = [
+            get_talk_representation(talk, include_speaker=True)
+            for talk in talks
+        ]
+        response = send_request(
+            url, "post", payload, user=unpublished_event.organizer
+        )
+
+        assert response.status_code == 400
+        assert response.data == {
+            "non_field_errors": ["Talk 2 collides with other talks."]
+        }
+        assert unpublished_event.talk_set.count() == int(existing)
+
+    def test_when_speaker_is_unknown_then_create_talks_bulk_should_fail(
+        self, unpublished_event, send_request, get_talk_representation
+    ):
+        start = timezone.now() + timezone.timedelta(days=1)
+        talks = [
+            TalkFactory.build(
+                speaker=UserFactory.create(),
+                event=unpublished_event,
+                start=start + timezone.timedelta(hours=hours),
+                end=start + timezone.timedelta(hours=hours + 1),
+            )
+            for hours in [0, 1]
+        ]
+        payload = [
+            get_talk_representation(talk, include_speaker=True)
+            for talk in talks
+        ]
+        payload[1]["speaker"] = "unknown"
+
+        url = reverse("event-bulk-talks", kwargs={"pk": unpublished_event.pk})
+        response = send_request(
+            url, "post", payload, user=unpublished_event.organizer
+        )
+
+        assert response.status_code == 400
+        assert response.data == {
+            "non_field_errors": ["Talk 1 speaker does not exist."]
+        }
+        assert unpublished_event.talk_set.count() == 0
+
+    def test_when_not_organizer_then_create_event_talks_bulk_should_fail(
+        self, unpublished_event, send_request
+    ):
+        url = reverse("event-bulk-talks", kwargs={"pk": unpublished_event.pk})
+        response = send_request(url, "post", [], user=UserFactory.create())
+        assert response.status_code == 403
@@ -4,6 +4,8 @@ from django.utils import timezone
 from tests.events.factories import EventFactory
 from tests.talks.factories import TalkFactory
 from tests.users.factories import UserFactory
+from talks.viewers import add_viewer, remove_viewer
+from chats.models import Message
 
 pytestmark = pytest.mark.django_db
 
@@ -16,6 +18,9 @@ class TestTalkEndpoints:
             ("talk-detail", "patch"),
             ("talk-detail", "delete"),
             ("talk-retrieve-stream-key", "get"),
+            ("talk-retrieve-viewers", "get"),
+            ("talk-list-messages", "get"),
+            ("talk-update-slow-mode", "put"),
         ],
     )
     def test_when_not_authenticated_then_appropriate_endpoints_should_fail(
@@ -33,6 +38,9 @@ class TestTalkEndpoints:
             ("talk-detail", "patch"),
             ("talk-detail", "delete"),
             ("talk-retrieve-stream-key", "get"),
+            ("talk-retrieve-viewers", "get"),
+            ("talk-list-messages", "get"),
+            ("talk-update-slow-mode", "put"),
         ],
     )
     def test_when_not_speaker_then_appropriate_endpoints_should_fail(
@@ -114,3 +122,82 @@ class TestTalkEndpoints:
         response = send_request(url, "get", user=talk.speaker)
         assert response.status_code == 200
         assert type(response.data["stream_key"]) is str
+
+    def test_retrieve_viewers(self, send_request, assert_num_queries):
+        talk = TalkFactory.create()
+        users = UserFactory.create_batch(2)
+        add_viewer(talk.pk, users[0].pk, "client-1")
+        add_viewer(talk.pk, users[0].pk, "client-2")
+        add_viewer(talk.pk, users[1].pk, "client-3")
+        remove_viewer(talk.pk, "client-1")
+
+        url = reverse("talk-retrieve-viewers", kwargs={"pk": talk.pk})
+        for user in [talk.speaker, talk.event.organizer]:
+            # The talk with its event
+            with assert_num_queries(1):
+                response = send_request(url, "get", user=user)
+            assert response.status_code == 200
+            assert response.data == {"viewers": 2, "unique_viewers": 2}
+
+    def test_list_messages(self, send_request, assert_num_queries):
+        talk = TalkFactory.create(event=EventFactory.create(is_published=True))
+        user = UserFactory.create()
+        talk.event.attendees.add(user.pk)
+        messages = Message.objects.bulk_create(
+            Message(
+                talk=talk,
+                user=user,
+                message=f"Message {i}",
+                stream_id=f"{i}-0",
+                created_at=timezone.now(),
+            )
+            for i in range(3)
+        )
+
+        url = reverse("talk-list-messages", kwargs={"pk": talk.pk})
+        for viewer in [user, talk.speaker, talk.event.organizer]:
+            response = send_request(url, "get", user=viewer)
+            assert response.status_code == 200
+            assert [message["id"] for message in response.data["results"]] == [
+                message.pk for message in reversed(messages)
+            ]
+
+        # The talk with its event, the attendee and the messages
+        with assert_num_queries(3):
+            response = send_request(url, "get", {"page_size": 2}, user=user)
+        assert response.data["results"][0] == {
+            "id": messages[2].pk,
+            "stream_id": "2-0",
+            "username": user.username,
+            "message": "Message 2",
+            "created_at": response.data["results"][0]["created_at"],
+        }
+
+        talk.event.is_published = False
+        talk.event.save()
+        response = send_request(url, "get", user=user)
+        assert response.status_code == 403
+
+    def test_update_slow_mode(self, send_request):
+        talk = TalkFactory.create(
+            event=EventFactory.create(is_published=True),
+            start=timezone.now() - timezone.timedelta(minutes=1),
+        )
+        url = reverse("talk-update-slow-mode", kwargs={"pk": talk.pk})
+        response = send_request(
+            url, "put", {"slow_mode": 30}, user=talk.speaker
+        )
+        assert response.status_code == 403
+
+        response = send_request(
+            url, "put", {"slow_mode": 24 * 60 * 60}, user=talk.event.organizer
+        )
+        assert response.status_code == 400
+
+        response = send_request(
+            url, "put", {"slow_mode": 30}, user=talk.event.organizer
+        )
+        assert response.status_code == 200
+        assert response.data == {"slow_mode": 30}
+        talk.refresh_from_db()
+        assert talk.slow_mode == 30
@@ -0,0 +1,39 @@
+import pytest
+from talks.models import TalkViewers
+from talks.tasks import rollup_viewers
+from talks.viewers import (
+    add_viewer,
+    clear_viewers,
+    get_active_talk_ids,
+    remove_viewer,
+)
+from tests.talks.factories import TalkFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestTalkTasks:
+    def test_rollup_viewers(self, assert_num_queries):
+        talks = TalkFactory.create_batch(3)
+        add_viewer(talks[0].pk, 1, "client-1")
+        add_viewer(talks[0].pk, 2, "client-2")
+        add_viewer(talks[1].pk, 1, "client-3")
+        remove_viewer(talks[1].pk, "client-3")
+        add_viewer(talks[2].pk, 1, "client-4")
+        talks[2].delete()
+
+        # The existing talks and the samples
+        with assert_num_queries(2):
+            assert rollup_viewers() == {"talks": 2}
+
+        samples = TalkViewers.objects.order_by("talk_id")
+        assert [
+            (sample.talk_id, sample.viewers, sample.unique_viewers)
+            for sample in samples
+        ] == [(talks[0].pk, 2, 2), (talks[1].pk, 0, 1)]
+        assert get_active_talk_ids() == [talks[0].pk]
+
+        clear_viewers(talks[0].pk)
+        rollup_viewers()
+        assert get_active_talk_ids() == []
+        assert TalkViewers.objects.count() == 3
@@ -1,4 +1,5 @@
 import pytest
+from core.images import IMAGE_VARIANTS
 
 
 @pytest.fixture
@@ -14,6 +15,9 @@ def get_user_representation():
         }
         if include_avatar:
             representation["avatar"] = user.avatar.url
+            representation["avatar_variants"] = {
+                variant: user.avatar.url for variant in IMAGE_VARIANTS
+            }
         return representation
 
     return get_user_representation
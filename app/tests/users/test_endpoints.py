@@ -1,9 +1,11 @@
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from tests.users.factories import UserFactory
 from django.contrib.auth import authenticate
 from tests.events.factories import EventFactory
 from tests.talks.factories import TalkFactory
+from core.images import IMAGE_VARIANTS
 
 
 pytestmark = pytest.mark.django_db
@@ -117,12 +119,32 @@ class TestUserEndpoints:
                 "first_name": user.first_name,
                 "last_name": user.last_name,
                 "avatar": user.avatar.url,
+                "avatar_variants": {
+                    variant: user.avatar.url for variant in IMAGE_VARIANTS
+                },
                 "headline": user.headline,
                 "bio": user.bio,
             }
         )
         assert response.data == expected_response_data
 
+    def test_retrieve_user_conditional_get(self, send_request):
+        user = UserFactory.create()
+        url = reverse("user-detail", kwargs={"username": user.username})
+
+        response = send_request(url, "get")
+        assert response.status_code == 200
+        etag = response["ETag"]
+
+        response = send_request(url, "get", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        user.headline = "New headline"
+        user.save()
+        response = send_request(url, "get", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["headline"] == "New headline"
+
     def test_update_user(self, send_request, get_user_representation):
         user = UserFactory.create()
         data = UserFactory.build(username=user.username, email=user.email)
@@ -137,6 +159,9 @@ class TestUserEndpoints:
 
         expected_response_data = representation
         expected_response_data["avatar"] = user.avatar.url
+        expected_response_data["avatar_variants"] = {
+            variant: user.avatar.url for variant in IMAGE_VARIANTS
+        }
 
         assert response.status_code == 200
         assert response.data == expected_response_data
@@ -194,6 +219,78 @@ class TestUserEndpoints:
         assert response.status_code == 200
         assert type(response.data[key_name]) is str
 
+    @pytest.mark.parametrize(
+        "signed_keys, num_queries", [(True, 1), (False, 4)]
+    )
+    @pytest.mark.parametrize(
+        "endpoint_name",
+        ["user-retrieve-chat-key", "user-retrieve-play-stream-key"],
+    )
+    def test_retrieve_keys_query_count(
+        self,
+        endpoint_name,
+        signed_keys,
+        num_queries,
+        settings,
+        send_request,
+        assert_num_queries,
+    ):
+        settings.SIGNED_KEYS = signed_keys
+        user = UserFactory.create()
+        url = reverse(endpoint_name, kwargs={"username": user.username})
+        # The user, and the three writes of a knox-backed key
+        with assert_num_queries(num_queries):
+            response = send_request(url, "get", user=user)
+        assert response.status_code == 200
+
+    def test_retrieve_keys_is_throttled_by_user(self, settings, send_request):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"keys_user": "3/min"},
+        }
+        user, other_user = UserFactory.create_batch(2)
+
+        for endpoint_name in [
+            "user-retrieve-chat-key",
+            "user-retrieve-play-stream-key",
+            "user-retrieve-chat-key",
+        ]:
+            url = reverse(endpoint_name, kwargs={"username": user.username})
+            response = send_request(url, "get", user=user)
+            assert response.status_code == 200
+
+        response = send_request(url, "get", user=user)
+        assert response.status_code == 429
+        assert "Retry-After" in response
+
+        url = reverse(endpoint_name, kwargs={"username": other_user.username})
+        response = send_request(url, "get", user=other_user)
+        assert response.status_code == 200
+
+    def test_retrieve_keys_rejected_by_ip_are_not_counted_by_user(
+        self, settings, send_request
+    ):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                "keys_user": "2/min",
+                "keys_ip": "1/min",
+            },
+        }
+        user = UserFactory.create()
+        url = reverse(
+            "user-retrieve-chat-key", kwargs={"username": user.username}
+        )
+
+        response = send_request(url, "get", user=user)
+        assert response.status_code == 200
+        for _ in range(3):
+            response = send_request(url, "get", user=user)
+            assert response.status_code == 429
+
+        response = send_request(url, "get", user=user, REMOTE_ADDR="10.0.0.1")
+        assert response.status_code == 200
+
     def test_list_user_booked_events(self, send_request):
         events = EventFactory.create_batch(3)
         user = UserFactory.create()
@@ -220,6 +317,69 @@ class TestUserEndpoints:
         assert response.status_code == 200
         assert len(response.data["results"]) == 3
 
+    def test_list_user_events_query_count(
+        self, send_request, assert_num_queries
+    ):
+        user = UserFactory.create()
+        EventFactory.create_batch(3, organizer=user)
+        for event in EventFactory.create_batch(3):
+            event.attendees.add(user.pk)
+
+        for endpoint_name in [
+            "user-list-organized-events",
+            "user-list-booked-events",
+        ]:
+            url = reverse(endpoint_name, kwargs={"username": user.username})
+            # The user, the count and the events with their organizers
+            with assert_num_queries(3):
+                response = send_request(url, "get", user=user)
+            assert response.status_code == 200
+            assert len(response.data["results"]) == 3
+
+    def test_filter_user_events(self, send_request):
+        user = UserFactory.create()
+        now = timezone.now()
+        upcoming = [
+            EventFactory.create(
+                organizer=user,
+                is_published=True,
+                started_at=now + timezone.timedelta(days=days),
+            )
+            for days in [2, 1]
+        ]
+        past = EventFactory.create(
+            organizer=user,
+            is_published=True,
+            started_at=now - timezone.timedelta(days=1),
+        )
+        draft = EventFactory.create(organizer=user, is_published=False)
+        for event in upcoming + [past]:
+            event.attendees.add(user.pk)
+
+        for endpoint_name in [
+            "user-list-organized-events",
+            "user-list-booked-events",
+        ]:
+            base_url = reverse(
+                endpoint_name, kwargs={"username": user.username}
+            )
+            expected = {
+                "upcoming": [upcoming[1].pk, upcoming[0].pk],
+                "past": [past.pk],
+                "draft": [draft.pk]
+                if endpoint_name == "user-list-organized-events"
+                else [],
+            }
+            for status, event_ids in expected.items():
+                url = f"{base_url}?status={status}"
+                response = send_request(url, "get", user=user)
+                assert response.status_code == 200
+                ids = [event["id"] for event in response.data["results"]]
+                assert ids == event_ids
+
+            response = send_request(f"{base_url}?status=all", "get", user=user)
+            assert response.status_code == 400
+
     def test_list_user_talks(self, send_request):
         user = UserFactory.create()
         TalkFactory.create_batch(3, speaker=user)
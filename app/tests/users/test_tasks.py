@@ -0,0 +1,33 @@
+import pytest
+from django.utils import timezone
+from knox.models import AuthToken
+from tests.users.factories import UserFactory
+from users.models import ChatKey, PlayStreamKey, VerificationKey
+from users.tasks import clean_expired_tokens
+
+pytestmark = pytest.mark.django_db
+
+
+class TestUserTasks:
+    def test_clean_expired_tokens(self, assert_num_queries):
+        user = UserFactory.create()
+        models = [AuthToken, ChatKey, PlayStreamKey, VerificationKey]
+        for model in models:
+            for _ in range(2):
+                model.objects.create(user, timezone.timedelta(minutes=-1))
+            model.objects.create(user, timezone.timedelta(minutes=10))
+
+        # Each of the 3 batches selects its keys and deletes them from the
+        # 4 tables, without loading the rows, then the last select is empty
+        with assert_num_queries(3 * 5 + 1):
+            result = clean_expired_tokens(batch_size=3)
+
+        assert result["deleted"] == {
+            "knox.AuthToken": 8,
+            "users.ChatKey": 2,
+            "users.PlayStreamKey": 2,
+            "users.VerificationKey": 2,
+        }
+        for model in models:
+            assert model.objects.filter(expiry__lt=timezone.now()).count() == 0
+        assert AuthToken.objects.count() == 4
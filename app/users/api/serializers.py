@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from core.images import get_image_variant_urls
 from ..models import User
 
 
 class UserSerializer(serializers.ModelSerializer):
+    avatar_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = User
         fields = [
@@ -11,6 +14,7 @@ class UserSerializer(serializers.ModelSerializer):
             "first_name",
             "last_name",
             "avatar",
+            "avatar_variants",
             "headline",
             "bio",
             "password",
@@ -31,6 +35,9 @@ class UserSerializer(serializers.ModelSerializer):
             },
         }
 
+    def get_avatar_variants(self, user) -> dict:
+        return get_image_variant_urls(user.avatar, user.avatar_variants)
+
     def validate_email(self, email):
         if User.verified_objects.filter(email=email).exists():
             message = "Email already exists."
@@ -11,14 +11,33 @@ from drf_spectacular.utils import (
     OpenApiParameter,
 )
 from drf_spectacular.types import OpenApiTypes
+from core.conditional import conditional_response
+from core.throttling import (
+    IPScopedRateThrottle,
+    RollbackThrottlesMixin,
+    UserScopedRateThrottle,
+)
 from events.models import Event
 from events.api.serializers import EventSerializer
 from talks.models import Talk
 from talks.api.serializers import TalkWithEventDetailSerializer
-from ..models import User, ChatKey, PlayStreamKey
+from ..keys import create_key
+from ..models import User
 from .serializers import UserSerializer, UpdateUserSerializer
 from .permissions import UserPermission
 
+EVENT_STATUSES = ["upcoming", "past", "draft"]
+
+EVENT_STATUS_PARAMETER = OpenApiParameter(
+    name="status",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    default=None,
+    enum=EVENT_STATUSES,
+    description="Filter event status (upcoming/past/draft). "
+    "Upcoming events are ordered by the nearest first.",
+)
+
 
 @extend_schema_view(
     retrieve=extend_schema(responses={200: UserSerializer, 404: None}),
@@ -46,20 +65,24 @@ from .permissions import UserPermission
         },
     ),
     list_organized_events=extend_schema(
+        parameters=[EVENT_STATUS_PARAMETER],
         responses={
             200: EventSerializer(many=True),
+            400: None,
             401: None,
             403: None,
             404: None,
-        }
+        },
     ),
     list_booked_events=extend_schema(
+        parameters=[EVENT_STATUS_PARAMETER],
         responses={
             200: EventSerializer(many=True),
+            400: None,
             401: None,
             403: None,
             404: None,
-        }
+        },
     ),
     retrieve_chat_key=extend_schema(
         request=None,
@@ -74,12 +97,23 @@ from .permissions import UserPermission
             401: None,
             403: None,
             404: None,
+            429: None,
         },
         description="Retrieve a chat-key to be used in chats."
         "The key is intended to be temporal, so it will have a short expiry.",
     ),
     retrieve_play_stream_key=extend_schema(
         request=None,
+        parameters=[
+            OpenApiParameter(
+                name="talk",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                default=None,
+                description="Only allow the key to play this talk. "
+                "Ignored unless the keys are signed.",
+            )
+        ],
         responses={
             200: inline_serializer(
                 "play-stream-key-serializer",
@@ -88,20 +122,26 @@ from .permissions import UserPermission
                     "expiry": serializers.DateTimeField(),
                 },
             ),
+            400: None,
             401: None,
             403: None,
             404: None,
+            429: None,
         },
     ),
 )
 class UserViewSet(
-    mixins.RetrieveModelMixin, mixins.UpdateModelMixin, GenericViewSet
+    RollbackThrottlesMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    GenericViewSet,
 ):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [UserPermission]
     pagination_class = LimitOffsetPagination
     lookup_field = "username"
+    throttle_scope = None  # Set by the throttled actions
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -114,6 +154,15 @@ class UserViewSet(
         else:
             return self.serializer_class
 
+    def retrieve(self, request, *args, **kwargs):
+        user = self.get_object()
+        return conditional_response(
+            request,
+            user.updated_at,
+            [user.pk],
+            lambda: Response(self.get_serializer(user).data),
+        )
+
     @action(detail=True, methods=["get"], url_path="talks")
     def list_talks(self, request, username):
         user = self.get_object()
@@ -129,39 +178,66 @@ class UserViewSet(
         serializer = TalkWithEventDetailSerializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
-    @action(detail=True, methods=["get"], url_path="organized-events")
-    def list_organized_events(self, request, username):
-        # to do: support filtering event status
-        user = self.get_object()
-        queryset = Event.objects.filter(organizer=user).all()
+    def list_events(self, queryset):
+        queryset = queryset.select_related("organizer")
+        status_param = self.request.query_params.get("status", None)
+        if status_param is not None:
+            if status_param not in EVENT_STATUSES:
+                raise serializers.ValidationError(
+                    {"status": f"Must be one of {', '.join(EVENT_STATUSES)}."}
+                )
+            queryset = queryset.with_status(status_param)
+            if status_param == "upcoming":
+                queryset = queryset.order_by("started_at", "id")
+
         page = self.paginate_queryset(queryset)
         serializer = EventSerializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
+    @action(detail=True, methods=["get"], url_path="organized-events")
+    def list_organized_events(self, request, username):
+        user = self.get_object()
+        return self.list_events(Event.objects.filter(organizer=user))
+
     @action(detail=True, methods=["get"], url_path="booked-events")
     def list_booked_events(self, request, username):
         user = self.get_object()
-        queryset = user.booked_events.all()
-        page = self.paginate_queryset(queryset)
-        serializer = EventSerializer(page, many=True)
-        return self.get_paginated_response(serializer.data)
+        return self.list_events(user.booked_events.all())
 
-    @action(detail=True, methods=["get"], url_path="chat-key")
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="chat-key",
+        throttle_classes=[UserScopedRateThrottle, IPScopedRateThrottle],
+        throttle_scope="keys",
+    )
     def retrieve_chat_key(self, request, username):
         user = self.get_object()
         expiry = timezone.timedelta(minutes=10)
-        instance, token = ChatKey.objects.create(user, expiry)
+        token, expiry = create_key(user, "chat", expiry)
         return Response(
             status=status.HTTP_200_OK,
-            data={"chat_key": token, "expiry": instance.expiry},
+            data={"chat_key": token, "expiry": expiry},
         )
 
-    @action(detail=True, methods=["get"], url_path="play-stream-key")
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="play-stream-key",
+        throttle_classes=[UserScopedRateThrottle, IPScopedRateThrottle],
+        throttle_scope="keys",
+    )
     def retrieve_play_stream_key(self, request, username):
         user = self.get_object()
+        talk_id = request.query_params.get("talk", None)
+        if talk_id is not None:
+            try:
+                talk_id = serializers.IntegerField().run_validation(talk_id)
+            except serializers.ValidationError as error:
+                raise serializers.ValidationError({"talk": error.detail})
         expiry = timezone.timedelta(minutes=10)
-        instance, token = PlayStreamKey.objects.create(user, expiry)
+        token, expiry = create_key(user, "play_stream", expiry, talk_id)
         return Response(
             status=status.HTTP_200_OK,
-            data={"play_stream_key": token, "expiry": instance.expiry},
+            data={"play_stream_key": token, "expiry": expiry},
         )
@@ -0,0 +1,67 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from core.utils import CachedTokenAuthentication
+from .models import ChatKey, PlayStreamKey
+
+KEY_MODELS = {"chat": ChatKey, "play_stream": PlayStreamKey}
+
+
+def get_key_salt(purpose):
+    return f"users.keys.{purpose}"
+
+
+def create_key(user, purpose, expiry, talk_id=None):
+    """
+    Create a short-lived key of the given purpose for the user, and return
+    it with its expiry. Signed keys may be bound to a talk.
+    """
+    if not settings.SIGNED_KEYS:
+        instance, token = KEY_MODELS[purpose].objects.create(user, expiry)
+        return token, instance.expiry
+
+    expires_at = timezone.now() + expiry
+    token = signing.dumps(
+        {
+            "user": user.pk,
+            "expiry": int(expires_at.timestamp()),
+            "talk": talk_id,
+        },
+        salt=get_key_salt(purpose),
+    )
+    return token, expires_at
+
+
+def get_key_user_id(token, purpose, talk_id=None):
+    """
+    Return the id of the user of a valid key of the given purpose.
+    Signed keys are verified without any database access.
+    """
+    msg = _("Invalid token.")
+    if not settings.SIGNED_KEYS:
+        knox_auth = CachedTokenAuthentication()
+        knox_auth.model = KEY_MODELS[purpose]
+        user, _auth_token = knox_auth.authenticate_credentials(
+            token.encode("utf-8")
+        )
+        return user.pk
+
+    try:
+        payload = signing.loads(token, salt=get_key_salt(purpose))
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed(msg)
+    if payload["expiry"] <= timezone.now().timestamp():
+        raise exceptions.AuthenticationFailed(msg)
+    if payload["talk"] is not None and payload["talk"] != talk_id:
+        raise exceptions.AuthenticationFailed(msg)
+    return payload["user"]
+
+
+async def aget_key_user_id(token, purpose, talk_id=None):
+    """The async version of get_key_user_id."""
+    if settings.SIGNED_KEYS:
+        return get_key_user_id(token, purpose, talk_id)
+    return await sync_to_async(get_key_user_id)(token, purpose, talk_id)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0006_user_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="avatar_variants",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:27
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("knox", "0008_remove_authtoken_salt"),
+        ("users", "0007_user_image_variants"),
+    ]
+
+    # The expiry of every token model lives in the knox AuthToken table,
+    # which belongs to a third-party app.
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS knox_authtoken_expiry_idx "
+            "ON knox_authtoken (expiry)",
+            "DROP INDEX CONCURRENTLY IF EXISTS knox_authtoken_expiry_idx",
+        ),
+    ]
@@ -17,9 +17,12 @@ class ExtraUserManagers(models.Model):
 
 class User(AbstractUser, ExtraUserManagers):
     avatar = models.ImageField(blank=True, upload_to="users/avatars")
+    # Maps each of core.images.IMAGE_VARIANTS to its storage name
+    avatar_variants = models.JSONField(default=dict, editable=False)
     headline = models.CharField(blank=True, max_length=60)
     bio = models.TextField(blank=True, max_length=255)
     is_verified = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class ChatKey(AuthToken):
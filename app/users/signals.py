@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from knox.models import AuthToken
+from core.images import reset_image_variants, schedule_image_variants
+from core.utils import invalidate_cached_token
+from .models import ChatKey, PlayStreamKey, User, VerificationKey
+
+
+@receiver(pre_save, sender=User)
+def pre_save_user_reset_avatar_variants(sender, instance, **kwargs):
+    reset_image_variants(instance, "avatar")
+
+
+@receiver(post_save, sender=User)
+def post_save_user_schedule_avatar_variants(sender, instance, **kwargs):
+    schedule_image_variants(instance, "avatar")
+
+
+@receiver(post_delete, sender=AuthToken)
+@receiver(post_delete, sender=ChatKey)
+@receiver(post_delete, sender=PlayStreamKey)
+@receiver(post_delete, sender=VerificationKey)
+def post_delete_token_invalidate_cache(sender, instance, **kwargs):
+    invalidate_cached_token(instance)
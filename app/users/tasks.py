@@ -1,11 +1,50 @@
+import logging
+import time
+from collections import Counter
 from celery import shared_task
-from .models import ChatKey, PlayStreamKey
 from knox.models import AuthToken
+from django.db import router, transaction
 from django.utils import timezone
+from .models import ChatKey, PlayStreamKey, VerificationKey
+
+logger = logging.getLogger(__name__)
+
+CLEAN_EXPIRED_TOKENS_BATCH_SIZE = 1000
 
 
 @shared_task(name="users__clean_expired_tokens")
-def clean_expired_tokens():
-    models = [AuthToken, ChatKey, PlayStreamKey]
-    for model in models:
-        model.objects.filter(expiry__lt=timezone.now()).delete()
+def clean_expired_tokens(batch_size=CLEAN_EXPIRED_TOKENS_BATCH_SIZE):
+    """
+    Delete the expired tokens in batches of primary keys, so that each
+    batch is a short transaction. ChatKey, PlayStreamKey and VerificationKey
+    extend AuthToken, so their rows are deleted before the AuthToken rows.
+    The rows are deleted without loading them or sending post_delete, as
+    expired tokens have no cached entries left to invalidate.
+    """
+    started = time.monotonic()
+    now = timezone.now()
+    deleted = Counter()
+    expired_tokens = AuthToken.objects.filter(expiry__lt=now)
+    while True:
+        digests = list(
+            expired_tokens.order_by("expiry").values_list("pk", flat=True)[
+                :batch_size
+            ]
+        )
+        if not digests:
+            break
+        using = router.db_for_write(AuthToken)
+        with transaction.atomic(using=using):
+            for model in [ChatKey, PlayStreamKey, VerificationKey, AuthToken]:
+                count = model.objects.filter(pk__in=digests)._raw_delete(using)
+                if count:
+                    deleted[model._meta.label] += count
+
+    duration = time.monotonic() - started
+    logger.info(
+        "Deleted expired tokens in %.2fs: %s",
+        duration,
+        ", ".join(f"{label}={count}" for label, count in deleted.items())
+        or "none",
+    )
+    return {"deleted": dict(deleted), "duration": duration}